@@ -11,7 +11,16 @@ __version__ = "1.0.0"
 __author__ = "AI-Notebooks Project"
 
 from .magic_commands import AIAssistantMagics
-from .model_playground import ModelPlayground
 from .utils import setup_assistant
 
+
+def __getattr__(name):
+    # ModelPlayground pulls in ipywidgets and every provider SDK, so it is only
+    # imported when first accessed rather than on `%load_ext`.
+    if name == 'ModelPlayground':
+        from .model_playground import ModelPlayground
+        return ModelPlayground
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = ['AIAssistantMagics', 'ModelPlayground', 'setup_assistant']
\ No newline at end of file
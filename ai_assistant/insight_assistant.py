@@ -2,9 +2,17 @@
 Insight Assistant for AI-powered data analysis in Jupyter notebooks.
 """
 
+import asyncio
 import pandas as pd
 from IPython.display import display, HTML
 
+# One focus per suggested visualization; each is requested as its own prompt.
+VIZ_FOCUSES = (
+    "the distribution of the most important variable",
+    "the relationship between two related variables",
+    "a comparison across categories or over time",
+)
+
 class InsightAssistant:
     """
     AI-powered assistant to generate insights and visualizations from DataFrames.
@@ -15,13 +23,17 @@ class InsightAssistant:
         # The actual instance will be injected from the magic command.
         self.magics = None
 
-    def get_insights(self, df: pd.DataFrame, model: str = 'auto'):
+    async def get_insights(self, df: pd.DataFrame, model: str = 'auto', temperature: float = 0.2):
         """
         Generate insights and visualization suggestions for a DataFrame.
 
+        The summary and each visualization are requested concurrently as
+        separate, smaller prompts.
+
         Args:
             df (pd.DataFrame): The DataFrame to analyze.
             model (str): The AI model to use.
+            temperature (float): Sampling temperature for every prompt.
 
         Returns:
             dict: A dictionary containing 'summary' and 'visualizations'.
@@ -29,62 +41,63 @@ class InsightAssistant:
         if not isinstance(df, pd.DataFrame):
             raise TypeError("Input must be a pandas DataFrame.")
 
-        # Get DataFrame summary
-        df_head = df.head().to_string()
-        df_info = df.info(verbose=False, buf=None)
-
-        # Create a detailed prompt for the AI
-        prompt = f"""
-Analyze the following pandas DataFrame and provide:
-1. A brief, insightful summary of the data.
-2. Three distinct and relevant visualization suggestions using Plotly Express.
-   - For each suggestion, provide the Python code to generate the plot.
-   - The code should be ready to execute.
-   - Choose plots that are genuinely insightful for this data.
-   - Do not use `fig.show()`, just the `px.` call.
-
-DataFrame Head:
+        # Get DataFrame summary (df.info() prints and returns None, so build it directly)
+        df_head = df.head(5).to_csv(index=False)
+        df_info = (f"shape={df.shape}, dtypes={dict(df.dtypes.astype(str))}, "
+                   f"memory={df.memory_usage(deep=False).sum()}")
+
+        data_context = f"""
+DataFrame Head (CSV):
 {df_head}
 
 DataFrame Info:
 {df_info}
-
-Please format the output as a JSON object with two keys: 'summary' and 'visualizations'.
-'visualizations' should be a list of strings, where each string is a single line of Plotly Express code.
 """
 
-        try:
-            response_text = self.magics._get_ai_response(prompt, model)
-
-            # Clean up the response to extract the JSON part
-            json_response = self._extract_json(response_text)
-
-            return json_response
-
-        except Exception as e:
-            return {
-                'summary': f"Error generating insights: {e}",
-                'visualizations': []
-            }
-
-    def _extract_json(self, text: str) -> dict:
-        """Extract JSON object from a string, handling markdown code blocks."""
-        try:
-            # Find the start and end of the JSON object
-            start_index = text.find('{')
-            end_index = text.rfind('}') + 1
-
-            if start_index == -1 or end_index == 0:
-                raise ValueError("No JSON object found in the response.")
-
-            json_str = text[start_index:end_index]
-
-            import json
-            return json.loads(json_str)
+        summary_prompt = f"""
+Analyze the following pandas DataFrame and provide a brief, insightful summary of the data.
+{data_context}
+Respond with the summary text only.
+"""
 
-        except (ValueError, json.JSONDecodeError) as e:
-            # Fallback for simple cases if JSON parsing fails
-            return {
-                'summary': "Could not parse AI response.",
-                'visualizations': []
-            }
+        viz_prompts = [
+            f"""
+Suggest one Plotly Express visualization for the following pandas DataFrame (assume it is named `df`)
+that shows {focus}.
+{data_context}
+Respond with a single line of Python code calling `px.` and nothing else.
+Do not use `fig.show()` and do not wrap the code in markdown.
+"""
+            for focus in VIZ_FOCUSES
+        ]
+
+        coros = [
+            self.magics._get_ai_response_async(summary_prompt, model, temperature),
+            *[self.magics._get_ai_response_async(prompt, model, temperature)
+              for prompt in viz_prompts]
+        ]
+        summary, *viz_results = await asyncio.gather(*coros, return_exceptions=True)
+
+        if isinstance(summary, Exception):
+            summary = f"Error generating insights: {summary}"
+
+        visualizations = [
+            self._extract_code(result) for result in viz_results
+            if not isinstance(result, Exception)
+        ]
+
+        return {
+            'summary': summary.strip(),
+            'visualizations': [code for code in visualizations if code]
+        }
+
+    def _extract_code(self, text: str) -> str:
+        """Extract the single `px.` line from a response, handling markdown code blocks."""
+        lines = [line.strip() for line in text.strip().splitlines()]
+        code_lines = [line for line in lines if line and not line.startswith('```')]
+
+        for line in code_lines:
+            if 'px.' in line:
+                return line
+
+        return code_lines[0] if code_lines else ''
@@ -5,18 +5,126 @@ This module provides IPython magic commands that integrate AI assistance
 directly into notebook workflows.
 """
 
+import io
 import os
+import ast
+import html
 import json
+import uuid
+import queue
+import atexit
 import asyncio
+import threading
+import functools
+import importlib
+import contextlib
 from typing import Optional, Dict, Any, List
 from IPython.core.magic import Magics, magics_class, line_magic, cell_magic
 from IPython.core.magic_arguments import (argument, magic_arguments, parse_argstring)
 from IPython.display import display, HTML, Markdown, Javascript
-import pandas as pd
-import openai
-import anthropic
-import google.generativeai as genai
-from ai_assistant.insight_assistant import InsightAssistant
+import numpy as np
+from ai_assistant.response_cache import ResponseCache
+from ai_assistant.rate_limit import PROVIDER_LIMITS, ProviderLimiter
+from ai_assistant.retry import with_retry
+
+
+@functools.lru_cache(maxsize=None)
+def _import_module(name: str):
+    """Import a heavy dependency on first use so unused providers cost nothing at load."""
+    return importlib.import_module(name)
+
+
+def _import_httpx():
+    """Import the HTTP package the provider SDKs are built on."""
+    try:
+        # Newer provider SDKs are built on httpx2; the shared pool must match.
+        return _import_module('httpx2')
+    except ImportError:
+        return _import_module('httpx')
+
+
+# Prompt templates; only the selected one is formatted per call
+_ACTION_TEMPLATES = {
+    'explain': "Explain this code step by step:\n\n```python\n{cell}\n```",
+    'optimize': "Suggest optimizations for this code:\n\n```python\n{cell}\n```",
+    'debug': "Help debug this code and identify potential issues:\n\n```python\n{cell}\n```",
+    'document': "Add comprehensive docstrings and comments to this code:\n\n```python\n{cell}\n```",
+    'test': "Generate unit tests for this code:\n\n```python\n{cell}\n```"
+}
+
+_GENERATE_TEMPLATE = """Generate {language} code for the following requirement:
+
+{description}
+
+Please provide clean, well-commented code with proper error handling where appropriate."""
+
+# Streamed responses refresh the display once per this many chunks to avoid
+# flooding the IOPub channel
+_STREAM_UPDATE_CHUNKS = 8
+
+# Seconds between status checks for submitted provider batches
+_BATCH_POLL_INTERVAL = 30
+
+# Default temperature for the code and insight magics; low enough for the
+# response cache to serve repeated requests
+_CODE_TEMPERATURE = 0.2
+
+# Provider key -> (display name, API key environment variable)
+_MODELS_INFO = {
+    'openai': ('OpenAI GPT', 'OPENAI_API_KEY'),
+    'anthropic': ('Anthropic Claude', 'ANTHROPIC_API_KEY'),
+    'gemini': ('Google Gemini', 'GOOGLE_API_KEY')
+}
+
+_HELP_HTML = HTML("""
+<div style="font-family: monospace; background: #f5f5f5; padding: 15px; border-radius: 5px;">
+<h3>🤖 AI Assistant Commands</h3>
+
+<h4>Chat Commands:</h4>
+<ul>
+    <li><code>%ai_chat [question]</code> - Chat with AI about your notebook</li>
+    <li><code>%ai_models</code> - List available AI models</li>
+    <li><code>%ai_help</code> - Show this help</li>
+</ul>
+
+<h4>Code Analysis:</h4>
+<ul>
+    <li><code>%%ai_code --action explain</code> - Explain code in cell</li>
+    <li><code>%%ai_code --action optimize</code> - Suggest optimizations</li>
+    <li><code>%%ai_code --action debug</code> - Help debug code</li>
+    <li><code>%%ai_code --action document</code> - Add documentation</li>
+    <li><code>%%ai_code --action test</code> - Generate unit tests</li>
+    <li><code>%%ai_code --batch</code> - Queue for a provider batch (cheaper, slower)</li>
+    <li><code>%ai_flush</code> - Submit queued batch requests</li>
+</ul>
+
+<h4>Code Generation:</h4>
+<ul>
+    <li><code>%ai_generate [description]</code> - Generate code from description</li>
+</ul>
+
+<h4>Data Analysis:</h4>
+<ul>
+    <li><code>%%ai_insight</code> - Generate insights and visualizations from a DataFrame</li>
+</ul>
+
+<h4>Options:</h4>
+<ul>
+    <li><code>--model/-m</code> - Choose AI model (openai, anthropic, gemini, auto)</li>
+    <li><code>--temperature/-t</code> - Set creativity level (0.0-1.0)</li>
+    <li><code>--language/-l</code> - Programming language for generation</li>
+</ul>
+
+<h4>Examples:</h4>
+<pre>
+%ai_chat How do I optimize this pandas dataframe operation?
+%ai_generate --model openai Create a function to calculate fibonacci numbers
+%%ai_code --action explain --model anthropic
+def complex_function(data):
+    return data.groupby('category').agg({'value': 'mean'})
+</pre>
+</div>
+""")
 
 
 @magics_class
@@ -26,22 +134,65 @@ class AIAssistantMagics(Magics):
     def __init__(self, shell=None):
         super().__init__(shell)
         self.clients = {}
+        self.async_clients = {}
+        self.cache = ResponseCache()
+        self.semantic_cache = os.getenv('AI_ASSIST_SEMANTIC_CACHE', '').lower() in ('1', 'true')
+        self._limiters = {provider: ProviderLimiter(provider) for provider in PROVIDER_LIMITS}
+        self._pending = []
+        self._insight_assistant = None
+        
+        # The kernel already owns an event loop, so provider coroutines run on
+        # a private loop in a daemon thread and magics wait on the result.
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(
+            target=self._loop.run_forever, name='ai-assistant-loop', daemon=True
+        )
+        self._loop_thread.start()
+        
+        self._http = None
+        self._genai = None
         self._setup_clients()
+        atexit.register(self.close)
+        
+        if os.getenv('AI_ASSIST_PREWARM', 'true').lower() not in ('0', 'false'):
+            for model in self.async_clients:
+                asyncio.run_coroutine_threadsafe(self._prewarm(model), self._loop)
     
     def _setup_clients(self):
         """Initialize AI clients based on available API keys."""
+        # One keep-alive pool shared by the async provider clients
+        if os.getenv('OPENAI_API_KEY') or os.getenv('ANTHROPIC_API_KEY'):
+            httpx = _import_httpx()
+            self._http = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=512, max_keepalive_connections=256),
+                timeout=120
+            )
+        
+        # The async clients don't retry on their own: with_retry owns the policy, so
+        # every attempt goes back through the rate limiter
+        
         # OpenAI
         if os.getenv('OPENAI_API_KEY'):
+            openai = _import_module('openai')
             self.clients['openai'] = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+            self.async_clients['openai'] = openai.AsyncOpenAI(
+                api_key=os.getenv('OPENAI_API_KEY'), http_client=self._http, max_retries=0
+            )
         
         # Anthropic
         if os.getenv('ANTHROPIC_API_KEY'):
+            anthropic = _import_module('anthropic')
             self.clients['anthropic'] = anthropic.Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
+            self.async_clients['anthropic'] = anthropic.AsyncAnthropic(
+                api_key=os.getenv('ANTHROPIC_API_KEY'), http_client=self._http, max_retries=0
+            )
         
-        # Google Gemini
+        # Google Gemini (the same model object exposes generate_content_async)
         if os.getenv('GOOGLE_API_KEY'):
+            self._genai = genai = _import_module('google.generativeai')
             genai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
             self.clients['gemini'] = genai.GenerativeModel('gemini-pro')
+            self.async_clients['gemini'] = self.clients['gemini']
     
     @line_magic
     @magic_arguments()
@@ -52,13 +203,13 @@ class AIAssistantMagics(Magics):
         args = parse_argstring(self.ai_chat, line)
         
         if not line.strip():
-            return self._show_help()
+            self._show_help()
+            return
         
         prompt = line.split('--')[0].strip() if '--' in line else line.strip()
         
         try:
-            response = self._get_ai_response(prompt, args.model, args.temperature)
-            display(Markdown(f"**AI Assistant:** {response}"))
+            self._display_stream(prompt, args.model, args.temperature, "**AI Assistant:** ")
         except Exception as e:
             display(HTML(f'<div style="color: red;">Error: {str(e)}</div>'))
     
@@ -66,8 +217,12 @@ class AIAssistantMagics(Magics):
     @magic_arguments()
     @argument('--model', '-m', default='auto', help='AI model to use')
     @argument('--action', '-a', default='explain', 
-              choices=['explain', 'optimize', 'debug', 'document', 'test'],
+              choices=list(_ACTION_TEMPLATES),
               help='Action to perform on the code')
+    @argument('--temperature', '-t', type=float, default=_CODE_TEMPERATURE,
+              help='Temperature for generation')
+    @argument('--batch', '-b', action='store_true',
+              help='Queue the request for a provider batch submitted by %%ai_flush')
     def ai_code(self, line, cell):
         """Analyze, explain, or improve code using AI."""
         args = parse_argstring(self.ai_code, line)
@@ -76,19 +231,19 @@ class AIAssistantMagics(Magics):
             display(HTML('<div style="color: orange;">No code provided to analyze.</div>'))
             return
         
-        action_prompts = {
-            'explain': f"Explain this code step by step:\n\n```python\n{cell}\n```",
-            'optimize': f"Suggest optimizations for this code:\n\n```python\n{cell}\n```",
-            'debug': f"Help debug this code and identify potential issues:\n\n```python\n{cell}\n```",
-            'document': f"Add comprehensive docstrings and comments to this code:\n\n```python\n{cell}\n```",
-            'test': f"Generate unit tests for this code:\n\n```python\n{cell}\n```"
-        }
+        prompt = _ACTION_TEMPLATES[args.action].format(cell=cell)
         
-        prompt = action_prompts[args.action]
+        if args.batch:
+            try:
+                self._queue_batch(prompt, args.model, args.temperature,
+                                  f"**AI {args.action.title()}:**\n\n")
+            except Exception as e:
+                display(HTML(f'<div style="color: red;">Error: {str(e)}</div>'))
+            return
         
         try:
-            response = self._get_ai_response(prompt, args.model)
-            display(Markdown(f"**AI {args.action.title()}:**\n\n{response}"))
+            self._display_stream(prompt, args.model, args.temperature,
+                                 f"**AI {args.action.title()}:**\n\n")
         except Exception as e:
             display(HTML(f'<div style="color: red;">Error: {str(e)}</div>'))
     
@@ -96,65 +251,79 @@ class AIAssistantMagics(Magics):
     @magic_arguments()
     @argument('--model', '-m', default='auto', help='AI model to use')
     @argument('--language', '-l', default='python', help='Programming language')
+    @argument('--temperature', '-t', type=float, default=_CODE_TEMPERATURE,
+              help='Temperature for generation')
+    @argument('description', nargs='*', help='What the code should do')
     def ai_generate(self, line):
         """Generate code based on natural language description."""
         args = parse_argstring(self.ai_generate, line)
+        description = ' '.join(args.description)
         
-        if not line.strip():
+        if not description:
             display(HTML('<div style="color: orange;">Please provide a description of what you want to generate.</div>'))
             return
         
-        description = line.split('--')[0].strip() if '--' in line else line.strip()
-        
-        prompt = f"""Generate {args.language} code for the following requirement:
-
-{description}
-
-Please provide clean, well-commented code with proper error handling where appropriate."""
+        prompt = _GENERATE_TEMPLATE.format(language=args.language, description=description)
         
         try:
-            response = self._get_ai_response(prompt, args.model)
-            display(Markdown(f"**Generated Code:**\n\n{response}"))
+            self._display_stream(prompt, args.model, args.temperature, "**Generated Code:**\n\n")
         except Exception as e:
             display(HTML(f'<div style="color: red;">Error: {str(e)}</div>'))
     
     @line_magic
     def ai_models(self, line):
         """List available AI models and their status."""
-        status_html = "<h3>Available AI Models</h3><ul>"
-        
-        models_info = {
-            'openai': ('OpenAI GPT', 'OPENAI_API_KEY'),
-            'anthropic': ('Anthropic Claude', 'ANTHROPIC_API_KEY'),
-            'gemini': ('Google Gemini', 'GOOGLE_API_KEY')
-        }
+        available = set(self.clients)
+        parts = ["<h3>Available AI Models</h3><ul>"]
+        parts.extend(
+            f"<li><strong>{model_name}</strong>: "
+            f"{'✅ Available' if model_key in available else f'❌ Missing {env_var}'}</li>"
+            for model_key, (model_name, env_var) in _MODELS_INFO.items()
+        )
+        parts.append("</ul>")
         
-        for model_key, (model_name, env_var) in models_info.items():
-            status = "✅ Available" if model_key in self.clients else f"❌ Missing {env_var}"
-            status_html += f"<li><strong>{model_name}</strong>: {status}</li>"
+        if not self.clients:
+            parts.append('<div style="color: orange; margin-top: 10px;">No AI models available. Please set up API keys in your .env file.</div>')
         
-        status_html += "</ul>"
+        display(HTML("".join(parts)))
+    
+    @line_magic
+    def ai_flush(self, line):
+        """Submit queued --batch requests to the provider Batch APIs."""
+        if not self._pending:
+            display(HTML('<div style="color: orange;">No batched requests queued. Use %%ai_code --batch first.</div>'))
+            return
         
-        if not self.clients:
-            status_html += '<div style="color: orange; margin-top: 10px;">No AI models available. Please set up API keys in your .env file.</div>'
+        pending, self._pending = self._pending, []
+        by_model = {}
+        for entry in pending:
+            by_model.setdefault(entry['model'], []).append(entry)
         
-        display(HTML(status_html))
+        for model, entries in by_model.items():
+            submit = self._submit_openai_batch if model == 'openai' else self._submit_anthropic_batch
+            asyncio.run_coroutine_threadsafe(self._run_batch(submit, entries), self._loop)
+            display(HTML(f'<div>📦 Submitted {len(entries)} {model} request(s); results will appear in their cells when the batch completes.</div>'))
     
     @line_magic
     def ai_help(self, line):
         """Show help for AI assistant commands."""
-        return self._show_help()
+        self._show_help()
 
     @cell_magic
     @magic_arguments()
     @argument('--model', '-m', default='auto', help='AI model to use')
+    @argument('--temperature', '-t', type=float, default=_CODE_TEMPERATURE,
+              help='Temperature for generation')
     def ai_insight(self, line, cell):
         """Generate insights and visualizations from a DataFrame."""
         args = parse_argstring(self.ai_insight, line)
+        
+        import pandas as pd
+        from ai_assistant.insight_assistant import InsightAssistant
 
-        # Execute the cell to get the DataFrame
+        # Execute the cell once and capture its last expression as the DataFrame
         try:
-            df = self.shell.ex(cell)
+            df = self._eval_cell(cell)
             if not isinstance(df, pd.DataFrame):
                 display(HTML('<div style="color: red;">Error: The output of the cell must be a pandas DataFrame.</div>'))
                 return
@@ -162,39 +331,109 @@ Please provide clean, well-commented code with proper error handling where appro
             display(HTML(f'<div style="color: red;">Error executing cell: {e}</div>'))
             return
 
-        # Create an InsightAssistant instance
-        assistant = InsightAssistant()
-        assistant.magics = self # Pass the initialized clients
+        # Reuse one InsightAssistant across cells (created lazily to keep pandas off the load path)
+        if self._insight_assistant is None:
+            self._insight_assistant = InsightAssistant()
+            self._insight_assistant.magics = self # Pass the initialized clients
+        assistant = self._insight_assistant
 
         # Get and display insights
-        with display(HTML("<div>Generating insights...</div>"), display_id=True) as handle:
-            insights = assistant.get_insights(df, args.model)
-
-            # Custom display logic with interactive buttons
-            summary = insights.get('summary', 'No summary provided.')
-            visualizations = insights.get('visualizations', [])
-
-            html_output = f"<blockquote>{summary}</blockquote>"
-            if visualizations:
-                html_output += "<h4>Suggested Visualizations:</h4>"
-                for i, code in enumerate(visualizations):
-                    unique_id = f"btn_{i}_{os.urandom(4).hex()}"
-                    html_output += f"""
-                    <button id="{unique_id}">Generate Plot {i+1}</button>
-                    <pre style="display: inline-block; margin-left: 10px;"><code>{code}</code></pre><br>
-                    <script>
-                        document.getElementById('{unique_id}').onclick = function() {{
-                            var code = `{code.replace('`', '\\`')}`;
-                            Jupyter.notebook.insert_cell_below('code').set_text(code);
-                            Jupyter.notebook.select_next();
-                            Jupyter.notebook.execute_cell();
-                        }};
-                    </script>
-                    """
-            handle.update(HTML(html_output))
+        handle = display(HTML("<div>Generating insights...</div>"), display_id=True)
+        insights = self._run_async(assistant.get_insights(df, args.model, args.temperature))
 
-    def _get_ai_response(self, prompt: str, model: str = 'auto', temperature: float = 0.7) -> str:
-        """Get response from AI model."""
+        # Custom display logic with interactive buttons
+        summary = insights.get('summary', 'No summary provided.')
+        visualizations = insights.get('visualizations', [])
+
+        parts = [f"<blockquote>{html.escape(summary)}</blockquote>"]
+        if visualizations:
+            parts.append("<h4>Suggested Visualizations:</h4>")
+            for i, code in enumerate(visualizations):
+                unique_id = f"btn_{i}_{os.urandom(4).hex()}"
+                # json.dumps yields a safe JS string literal; "</" is split so the
+                # code can never close the surrounding <script> tag.
+                js_code = json.dumps(code).replace('</', '<\\/')
+                parts.append(f"""
+                <button id="{unique_id}">Generate Plot {i+1}</button>
+                <pre style="display: inline-block; margin-left: 10px;"><code>{html.escape(code)}</code></pre><br>
+                <script>
+                    document.getElementById('{unique_id}').onclick = function() {{
+                        var code = {js_code};
+                        Jupyter.notebook.insert_cell_below('code').set_text(code);
+                        Jupyter.notebook.select_next();
+                        Jupyter.notebook.execute_cell();
+                    }};
+                </script>
+                """)
+        handle.update(HTML("".join(parts)))
+
+    async def _prewarm(self, model: str):
+        """Open a provider connection ahead of the first request so it skips the TLS handshake."""
+        try:
+            client = self.async_clients[model]
+            if model == 'gemini':
+                await client.generate_content_async(
+                    'ping',
+                    generation_config=self._genai.types.GenerationConfig(max_output_tokens=1)
+                )
+            else:
+                await client.models.list()
+        except Exception:
+            pass
+    
+    def _eval_cell(self, cell: str):
+        """Run a cell in the user namespace and return the value it ends with.
+        
+        That is the trailing expression, or the name bound by a trailing
+        single-target assignment such as ``df = pd.read_csv(...)``.
+        """
+        tree = ast.parse(self.shell.transform_cell(cell))
+        last = tree.body[-1] if tree.body else None
+        user_ns = self.shell.user_ns
+        
+        if isinstance(last, ast.Expr):
+            # Rebind the trailing expression so the cell executes exactly once
+            result_name = '_ai_insight_result'
+            tree.body[-1] = ast.Assign(
+                targets=[ast.Name(id=result_name, ctx=ast.Store())],
+                value=last.value
+            )
+            ast.fix_missing_locations(tree)
+            exec(compile(tree, '<ai_insight>', 'exec'), user_ns)
+            return user_ns.pop(result_name)
+        
+        exec(compile(tree, '<ai_insight>', 'exec'), user_ns)
+        target = None
+        if isinstance(last, ast.Assign) and len(last.targets) == 1:
+            target = last.targets[0]
+        elif isinstance(last, ast.AnnAssign):
+            target = last.target
+        if isinstance(target, ast.Name):
+            return user_ns.get(target.id)
+        return None
+    
+    def close(self):
+        """Close the shared HTTP pool and stop the background event loop."""
+        if not self._loop.is_running():
+            return
+        
+        http, self._http = self._http, None
+        if http is not None:
+            try:
+                self._run_async(http.aclose())
+            except Exception:
+                pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        # Wait for the loop to stop so a later call (e.g. from atexit) sees it stopped
+        # instead of scheduling work that would never run
+        self._loop_thread.join()
+    
+    def _run_async(self, coro):
+        """Run a coroutine on the assistant's background loop and wait for it."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+    
+    def _resolve_model(self, model: str) -> str:
+        """Resolve 'auto' and validate that the requested model is configured."""
         if not self.clients:
             raise Exception("No AI models available. Please configure API keys.")
         
@@ -206,9 +445,120 @@ Please provide clean, well-commented code with proper error handling where appro
             available = ', '.join(self.clients.keys())
             raise Exception(f"Model '{model}' not available. Available models: {available}")
         
+        return model
+    
+    def _get_ai_response(self, prompt: str, model: str = 'auto', temperature: float = 0.7) -> str:
+        """Get response from AI model."""
+        return self._run_async(self._get_ai_response_async(prompt, model, temperature))
+    
+    async def _get_ai_response_async(self, prompt: str, model: str = 'auto', temperature: float = 0.7) -> str:
+        """Get response from AI model without blocking the event loop."""
+        model = self._resolve_model(model)
+        
+        if not self.cache.is_cacheable(temperature):
+            return await self._call_model(prompt, model, temperature)
+        
+        cached, embedding = await self._lookup_cache(prompt, model, temperature)
+        if cached is not None:
+            return cached
+        
+        response = await self._call_model(prompt, model, temperature)
+        self.cache.put(model, prompt, temperature, response, embedding)
+        return response
+    
+    def _display_stream(self, prompt: str, model: str = 'auto', temperature: float = 0.7,
+                        title: str = "") -> str:
+        """Stream a response into a Markdown display as it arrives."""
+        chunks = queue.Queue()
+        
+        async def produce():
+            try:
+                async for text in self._stream_ai_response_async(prompt, model, temperature):
+                    chunks.put(text)
+            finally:
+                chunks.put(None)
+        
+        future = asyncio.run_coroutine_threadsafe(produce(), self._loop)
+        handle = display(Markdown(title), display_id=True)
+        buffer = io.StringIO()
+        pending = 0
+        
+        while (text := chunks.get()) is not None:
+            buffer.write(text)
+            pending += 1
+            if pending >= _STREAM_UPDATE_CHUNKS:
+                handle.update(Markdown(title + buffer.getvalue()))
+                pending = 0
+        
+        # Re-raise any provider error after the partial output has been shown
+        future.result()
+        handle.update(Markdown(title + buffer.getvalue()))
+        return buffer.getvalue()
+    
+    async def _stream_ai_response_async(self, prompt: str, model: str = 'auto', temperature: float = 0.7):
+        """Yield response text incrementally as the provider produces it."""
+        model = self._resolve_model(model)
+        
+        cacheable = self.cache.is_cacheable(temperature)
+        embedding = None
+        if cacheable:
+            cached, embedding = await self._lookup_cache(prompt, model, temperature)
+            if cached is not None:
+                yield cached
+                return
+        
+        parts = []
+        # Retries happen outside the limiter: each attempt takes a fresh slot and
+        # tokens, and backoff sleeps never hold a concurrency slot
+        slot, deltas = await with_retry(lambda: self._open_stream(prompt, model, temperature))
+        async with slot:
+            async for text in deltas:
+                parts.append(text)
+                yield text
+        
+        if cacheable:
+            self.cache.put(model, prompt, temperature, ''.join(parts), embedding)
+    
+    async def _lookup_cache(self, prompt: str, model: str, temperature: float):
+        """Look up a cached response; returns (response or None, prompt embedding or None)."""
+        cached = self.cache.get(model, prompt, temperature)
+        if cached is not None:
+            return cached, None
+        
+        embedding = None
+        if self.semantic_cache and 'openai' in self.async_clients:
+            embedding = await self._embed_prompt(prompt)
+            if embedding is not None:
+                cached = self.cache.get_similar(model, embedding)
+        
+        return cached, embedding
+    
+    async def _embed_prompt(self, prompt: str) -> Optional[np.ndarray]:
+        """Embed a prompt for the semantic cache tier; None if embedding fails."""
+        try:
+            result = await self.async_clients['openai'].embeddings.create(
+                model="text-embedding-3-small",
+                input=prompt
+            )
+            return np.asarray(result.data[0].embedding, dtype=np.float32)
+        except Exception:
+            return None
+    
+    async def _call_model(self, prompt: str, model: str, temperature: float) -> str:
+        """Send a prompt to a resolved provider, retrying transient failures."""
+        return await with_retry(lambda: self._throttled_request(prompt, model, temperature))
+    
+    async def _throttled_request(self, prompt: str, model: str, temperature: float) -> str:
+        """Send a prompt to a resolved provider within its rate limits."""
+        async with self._limiters[model] as limiter:
+            await limiter.acquire(prompt)
+            return await self._request_model(prompt, model, temperature)
+    
+    async def _request_model(self, prompt: str, model: str, temperature: float) -> str:
+        """Issue a single provider request."""
         # Get response based on model type
         if model == 'openai':
-            response = self.clients['openai'].chat.completions.create(
+            response = await self.async_clients['openai'].chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[{"role": "user", "content": prompt}],
                 temperature=temperature,
@@ -217,7 +567,7 @@ Please provide clean, well-commented code with proper error handling where appro
             return response.choices[0].message.content
         
         elif model == 'anthropic':
-            response = self.clients['anthropic'].messages.create(
+            response = await self.async_clients['anthropic'].messages.create(
                 model="claude-3-haiku-20240307",
                 max_tokens=1000,
                 temperature=temperature,
@@ -226,9 +576,9 @@ Please provide clean, well-commented code with proper error handling where appro
             return response.content[0].text
         
         elif model == 'gemini':
-            response = self.clients['gemini'].generate_content(
+            response = await self.async_clients['gemini'].generate_content_async(
                 prompt,
-                generation_config=genai.types.GenerationConfig(
+                generation_config=self._genai.types.GenerationConfig(
                     temperature=temperature,
                     max_output_tokens=1000
                 )
@@ -238,66 +588,177 @@ Please provide clean, well-commented code with proper error handling where appro
         else:
             raise Exception(f"Unknown model: {model}")
     
+    def _queue_batch(self, prompt: str, model: str, temperature: float, title: str):
+        """Queue a prompt for the next %ai_flush and show a placeholder for its result."""
+        model = self._resolve_model(model)
+        if model not in ('openai', 'anthropic'):
+            raise Exception(f"Batch requests are not supported for '{model}'. Use openai or anthropic.")
+        
+        handle = display(Markdown(f"{title}⏳ Queued for batch submission (run `%ai_flush`)."), display_id=True)
+        self._pending.append({
+            'custom_id': f"request-{uuid.uuid4().hex}",
+            'model': model,
+            'prompt': prompt,
+            'temperature': temperature,
+            'title': title,
+            'handle': handle
+        })
+    
+    async def _run_batch(self, submit, entries: List[Dict[str, Any]]):
+        """Submit one provider batch and fill in each placeholder with its result."""
+        try:
+            results = await submit(entries)
+        except Exception as e:
+            results = {entry['custom_id']: f"Batch failed: {e}" for entry in entries}
+        
+        for entry in entries:
+            response = results.get(entry['custom_id'], "No result returned for this request.")
+            entry['handle'].update(Markdown(entry['title'] + response))
+    
+    async def _submit_openai_batch(self, entries: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Run entries through the OpenAI Batch API; returns {custom_id: response}."""
+        client = self.async_clients['openai']
+        lines = [
+            json.dumps({
+                'custom_id': entry['custom_id'],
+                'method': 'POST',
+                'url': '/v1/chat/completions',
+                'body': {
+                    'model': "gpt-3.5-turbo",
+                    'messages': [{"role": "user", "content": entry['prompt']}],
+                    'temperature': entry['temperature'],
+                    'max_tokens': 1000
+                }
+            })
+            for entry in entries
+        ]
+        
+        input_file = await client.files.create(
+            file=('input.jsonl', '\n'.join(lines).encode('utf-8')),
+            purpose='batch'
+        )
+        batch = await client.batches.create(
+            input_file_id=input_file.id,
+            endpoint='/v1/chat/completions',
+            completion_window='24h'
+        )
+        
+        while batch.status not in ('completed', 'failed', 'expired', 'cancelled'):
+            await asyncio.sleep(_BATCH_POLL_INTERVAL)
+            batch = await client.batches.retrieve(batch.id)
+        
+        if not batch.output_file_id:
+            raise Exception(f"batch {batch.id} ended with status '{batch.status}'")
+        
+        output = await client.files.content(batch.output_file_id)
+        results = {}
+        for line in output.text.splitlines():
+            record = json.loads(line)
+            if record.get('error'):
+                results[record['custom_id']] = f"Error: {record['error']}"
+            else:
+                body = record['response']['body']
+                results[record['custom_id']] = body['choices'][0]['message']['content']
+        return results
+    
+    async def _submit_anthropic_batch(self, entries: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Run entries through the Anthropic Message Batches API; returns {custom_id: response}."""
+        client = self.async_clients['anthropic']
+        batch = await client.messages.batches.create(requests=[
+            {
+                'custom_id': entry['custom_id'],
+                'params': {
+                    'model': "claude-3-haiku-20240307",
+                    'max_tokens': 1000,
+                    'temperature': entry['temperature'],
+                    'messages': [{"role": "user", "content": entry['prompt']}]
+                }
+            }
+            for entry in entries
+        ])
+        
+        while batch.processing_status != 'ended':
+            await asyncio.sleep(_BATCH_POLL_INTERVAL)
+            batch = await client.messages.batches.retrieve(batch.id)
+        
+        results = {}
+        async for result in await client.messages.batches.results(batch.id):
+            if result.result.type == 'succeeded':
+                results[result.custom_id] = result.result.message.content[0].text
+            else:
+                results[result.custom_id] = f"Error: request {result.result.type}"
+        return results
+    
+    async def _open_stream(self, prompt: str, model: str, temperature: float):
+        """Take a rate-limit slot and open a stream; returns (slot to release, text deltas)."""
+        slot = contextlib.AsyncExitStack()
+        limiter = await slot.enter_async_context(self._limiters[model])
+        try:
+            await limiter.acquire(prompt)
+            deltas = await self._start_stream(prompt, model, temperature)
+        except BaseException:
+            await slot.aclose()
+            raise
+        return slot, deltas
+    
+    async def _start_stream(self, prompt: str, model: str, temperature: float):
+        """Issue a single streaming provider request; returns an async iterator of text deltas."""
+        if model == 'openai':
+            stream = await self.async_clients['openai'].chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                max_tokens=1000,
+                stream=True
+            )
+            return (chunk.choices[0].delta.content async for chunk in stream
+                    if chunk.choices and chunk.choices[0].delta.content)
+        
+        elif model == 'anthropic':
+            stream = await self.async_clients['anthropic'].messages.create(
+                model="claude-3-haiku-20240307",
+                max_tokens=1000,
+                temperature=temperature,
+                messages=[{"role": "user", "content": prompt}],
+                stream=True
+            )
+            return (event.delta.text async for event in stream
+                    if event.type == 'content_block_delta' and event.delta.type == 'text_delta')
+        
+        elif model == 'gemini':
+            response = await self.async_clients['gemini'].generate_content_async(
+                prompt,
+                generation_config=self._genai.types.GenerationConfig(
+                    temperature=temperature,
+                    max_output_tokens=1000
+                ),
+                stream=True
+            )
+            return (chunk.text async for chunk in response)
+        
+        else:
+            raise Exception(f"Unknown model: {model}")
+    
     def _show_help(self):
         """Display help information for AI assistant."""
-        help_html = """
-        <div style="font-family: monospace; background: #f5f5f5; padding: 15px; border-radius: 5px;">
-        <h3>🤖 AI Assistant Commands</h3>
-        
-        <h4>Chat Commands:</h4>
-        <ul>
-            <li><code>%ai_chat [question]</code> - Chat with AI about your notebook</li>
-            <li><code>%ai_models</code> - List available AI models</li>
-            <li><code>%ai_help</code> - Show this help</li>
-        </ul>
-        
-        <h4>Code Analysis:</h4>
-        <ul>
-            <li><code>%%ai_code --action explain</code> - Explain code in cell</li>
-            <li><code>%%ai_code --action optimize</code> - Suggest optimizations</li>
-            <li><code>%%ai_code --action debug</code> - Help debug code</li>
-            <li><code>%%ai_code --action document</code> - Add documentation</li>
-            <li><code>%%ai_code --action test</code> - Generate unit tests</li>
-        </ul>
-        
-        <h4>Code Generation:</h4>
-        <ul>
-            <li><code>%ai_generate [description]</code> - Generate code from description</li>
-        </ul>
-
-        <h4>Data Analysis:</h4>
-        <ul>
-            <li><code>%%ai_insight</code> - Generate insights and visualizations from a DataFrame</li>
-        </ul>
-        
-        <h4>Options:</h4>
-        <ul>
-            <li><code>--model/-m</code> - Choose AI model (openai, anthropic, gemini, auto)</li>
-            <li><code>--temperature/-t</code> - Set creativity level (0.0-1.0)</li>
-            <li><code>--language/-l</code> - Programming language for generation</li>
-        </ul>
-        
-        <h4>Examples:</h4>
-        <pre>
-%ai_chat How do I optimize this pandas dataframe operation?
-%ai_generate --model openai Create a function to calculate fibonacci numbers
-%%ai_code --action explain --model anthropic
-def complex_function(data):
-    return data.groupby('category').agg({'value': 'mean'})
-        </pre>
-        </div>
-        """
-        display(HTML(help_html))
+        display(_HELP_HTML)
+
+_magics = None
 
 
 def load_ipython_extension(ipython):
     """Load the AI assistant extension in IPython/Jupyter."""
+    global _magics
     magics = AIAssistantMagics(ipython)
     ipython.register_magics(magics)
+    _magics = magics
     
     print("🤖 AI Assistant loaded! Use %ai_help to get started.")
 
 
 def unload_ipython_extension(ipython):
     """Unload the AI assistant extension."""
-    pass
\ No newline at end of file
+    global _magics
+    if _magics is not None:
+        _magics.close()
+        _magics = None
\ No newline at end of file
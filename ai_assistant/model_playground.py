@@ -6,19 +6,95 @@ AI models, comparing outputs, and tracking usage costs.
 """
 
 import os
+import sys
+import html
 import json
 import time
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+import asyncio
+import weakref
+import importlib.util
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Tuple, Optional, Any, Callable, Awaitable
+from dataclasses import dataclass, field, fields, is_dataclass, replace
 from datetime import datetime
+from types import MappingProxyType
+import numpy as np
 import ipywidgets as widgets
 from IPython.display import display, HTML, clear_output
-import openai
-import anthropic
-import google.generativeai as genai
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+
+def _import_httpx():
+    """Import the HTTP package the provider SDKs are built on."""
+    try:
+        # Newer provider SDKs are built on httpx2; the shared pool must match.
+        import httpx2 as httpx
+    except ImportError:
+        import httpx
+    return httpx
+
+
+def _close_http_pool(http):
+    """Close an httpx.AsyncClient from sync code, inside or outside a running loop."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(http.aclose())
+    else:
+        loop.create_task(http.aclose())
+
+
+def _json_default(obj):
+    """Encode the types the stdlib JSON encoder does not handle (orjson does natively)."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if is_dataclass(obj):
+        return {field.name: getattr(obj, field.name) for field in fields(obj)}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _replace_output(output: widgets.Output, text: str, name: str = 'stdout'):
+    """Swap an Output widget's content for `text` in one update, without flashing empty."""
+    output.outputs = ({'output_type': 'stream', 'name': name, 'text': text},)
+
+
+_executor = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Process-wide worker pool for fanning out over the sync SDK clients."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=ModelPlayground.MAX_CONCURRENT,
+                                       thread_name_prefix='playground')
+    return _executor
+
+
+_encoding = None
+
+
+def _count_tokens(text: str) -> int:
+    """Count tokens with tiktoken when the provider does not report usage."""
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+        except ImportError:
+            return len(text) // 4
+        _encoding = tiktoken.get_encoding('cl100k_base')
+    return len(_encoding.encode(text))
+
+
+# dataclass(slots=...) needs Python 3.10; older interpreters get a regular frozen dataclass
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
 class ModelResponse:
     """Data class for storing model responses."""
     model: str
@@ -28,52 +104,131 @@ class ModelResponse:
     tokens_used: int
     cost_estimate: float
     response_time: float
+    cached: bool = False
+    cost_micro: int = 0
+    preview: str = field(init=False)
+    
+    def __post_init__(self):
+        # Truncated once here so comparison views never re-slice the response
+        preview = self.response[:200] + "..." if len(self.response) > 200 else self.response
+        object.__setattr__(self, 'preview', preview)
 
 
 class ModelPlayground:
     """Interactive playground for testing and comparing AI models."""
     
-    # Cost estimates per 1K tokens (approximate)
-    COST_ESTIMATES = {
-        'gpt-3.5-turbo': {'input': 0.0015, 'output': 0.002},
-        'gpt-4': {'input': 0.03, 'output': 0.06},
-        'claude-3-haiku': {'input': 0.00025, 'output': 0.00125},
-        'claude-3-sonnet': {'input': 0.003, 'output': 0.015},
-        'gemini-pro': {'input': 0.0005, 'output': 0.0015}
+    # Cost estimates per 1K tokens (approximate); read-only
+    COST_ESTIMATES = MappingProxyType({
+        'gpt-3.5-turbo': MappingProxyType({'input': 0.0015, 'output': 0.002}),
+        'gpt-4': MappingProxyType({'input': 0.03, 'output': 0.06}),
+        'claude-3-haiku': MappingProxyType({'input': 0.00025, 'output': 0.00125}),
+        'claude-3-sonnet': MappingProxyType({'input': 0.003, 'output': 0.015}),
+        'gemini-pro': MappingProxyType({'input': 0.0005, 'output': 0.0015})
+    })
+    
+    # Fixed index per known model, and its (input, output) rates in integer
+    # micro-dollars per 1K tokens, so cost totals are exact
+    _MODEL_IDX = MappingProxyType({model: i for i, model in enumerate(COST_ESTIMATES)})
+    _RATES_MICRO = tuple(
+        (round(costs['input'] * 1_000_000), round(costs['output'] * 1_000_000))
+        for costs in COST_ESTIMATES.values()
+    )
+    
+    # Provider model IDs for the short names shown in the UI
+    MODEL_IDS = {
+        'claude-3-haiku': 'claude-3-haiku-20240307',
+        'claude-3-sonnet': 'claude-3-sonnet-20240229'
     }
     
+    # Longest prompt sent to the providers (characters)
+    MAX_PROMPT_LENGTH = 8192
+    
+    # Bounds on in-flight provider calls and how long each may take (seconds)
+    MAX_CONCURRENT = 8
+    REQUEST_TIMEOUT = 60
+    
+    # Most recent responses kept in the session history
+    MAX_HISTORY = 1000
+    
+    # Response cache bounds; semantic hits need near-identical prompt embeddings
+    CACHE_MAX_ENTRIES = 256
+    SEMANTIC_THRESHOLD = 0.95
+    
     def __init__(self):
         self.clients = {}
-        self.responses: List[ModelResponse] = []
-        self.total_cost = 0.0
+        self.aclients = {}
+        self.responses: deque = deque(maxlen=self.MAX_HISTORY)
+        self.total_cost_micro = 0
+        self._exact_cache: OrderedDict = OrderedDict()
+        self._embed_cache: List[Tuple[tuple, np.ndarray, ModelResponse]] = []
+        self._embedder = None
+        # Separate from the assistant's AI_ASSIST_SEMANTIC_CACHE, which embeds through OpenAI
+        self.semantic_cache = os.getenv('AI_ASSIST_PLAYGROUND_SEMANTIC_CACHE', 'false').lower() == 'true'
+        self._http = None
+        self._http_finalizer = None
+        self._genai = None
+        self._last_compare_key = None
+        self._last_compare_html = None
+        self._sem = asyncio.Semaphore(self.MAX_CONCURRENT)
+        self._dispatch: Dict[str, Callable[..., Awaitable[Optional[Tuple[int, int]]]]] = {}
+        self._sync_dispatch: Dict[str, Callable[..., Tuple[str, int, int]]] = {}
         self._setup_clients()
+        self._reset_usage()
         self._create_interface()
     
     def _setup_clients(self):
         """Initialize AI clients based on available API keys."""
+        # One keep-alive pool shared by the async clients, so repeated runs
+        # reuse the TCP+TLS connection (multiplexed over HTTP/2 when h2 is installed)
+        if os.getenv('OPENAI_API_KEY') or os.getenv('ANTHROPIC_API_KEY'):
+            httpx = _import_httpx()
+            self._http = httpx.AsyncClient(
+                http2=importlib.util.find_spec('h2') is not None,
+                timeout=60.0,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+            )
+            # Release the keep-alive connections when the playground is collected or at exit
+            self._http_finalizer = weakref.finalize(self, _close_http_pool, self._http)
+        
         # OpenAI
+        # Provider SDKs are imported only when their key is configured
         if os.getenv('OPENAI_API_KEY'):
+            import openai
             self.clients['openai'] = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+            self.aclients['openai'] = openai.AsyncOpenAI(
+                api_key=os.getenv('OPENAI_API_KEY'), http_client=self._http
+            )
+            self._dispatch['gpt-3.5-turbo'] = self._call_openai
+            self._sync_dispatch['gpt-3.5-turbo'] = self._request_openai
+            self._dispatch['gpt-4'] = self._call_openai
+            self._sync_dispatch['gpt-4'] = self._request_openai
         
         # Anthropic
         if os.getenv('ANTHROPIC_API_KEY'):
+            import anthropic
             self.clients['anthropic'] = anthropic.Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
+            self.aclients['anthropic'] = anthropic.AsyncAnthropic(
+                api_key=os.getenv('ANTHROPIC_API_KEY'), http_client=self._http
+            )
+            self._dispatch['claude-3-haiku'] = self._call_anthropic
+            self._sync_dispatch['claude-3-haiku'] = self._request_anthropic
+            self._dispatch['claude-3-sonnet'] = self._call_anthropic
+            self._sync_dispatch['claude-3-sonnet'] = self._request_anthropic
         
-        # Google Gemini
+        # Google Gemini (the same model object exposes generate_content_async)
         if os.getenv('GOOGLE_API_KEY'):
+            import google.generativeai as genai
+            self._genai = genai
             genai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
             self.clients['gemini'] = genai.GenerativeModel('gemini-pro')
+            self.aclients['gemini'] = self.clients['gemini']
+            self._dispatch['gemini-pro'] = self._call_gemini
+            self._sync_dispatch['gemini-pro'] = self._request_gemini
     
     def _create_interface(self):
         """Create the interactive widget interface."""
         # Model selection
-        available_models = []
-        if 'openai' in self.clients:
-            available_models.extend(['gpt-3.5-turbo', 'gpt-4'])
-        if 'anthropic' in self.clients:
-            available_models.extend(['claude-3-haiku', 'claude-3-sonnet'])
-        if 'gemini' in self.clients:
-            available_models.append('gemini-pro')
+        available_models = list(self._dispatch)
         
         if not available_models:
             self.model_selector = widgets.HTML(
@@ -136,6 +291,18 @@ class ModelPlayground:
             layout=widgets.Layout(width='150px')
         )
         
+        self.clear_cache_checkbox = widgets.Checkbox(
+            value=False,
+            description='Clear cache',
+            indent=False,
+            layout=widgets.Layout(width='120px')
+        )
+        
+        # Persistent side-by-side panes, one per selected model, that responses stream into
+        self.stream_area = widgets.HBox()
+        self._per_model_outputs: Dict[str, widgets.Output] = {}
+        self._rebuild_model_outputs()
+        
         self.output_area = widgets.Output()
         self.cost_display = widgets.HTML(value='<b>Total Cost: $0.00</b>')
         
@@ -143,6 +310,7 @@ class ModelPlayground:
         self.run_button.on_click(self._run_models)
         self.clear_button.on_click(self._clear_history)
         self.compare_button.on_click(self._compare_results)
+        self.model_selector.observe(self._rebuild_model_outputs, names='value')
         
         # Layout
         controls_row1 = widgets.HBox([
@@ -153,6 +321,7 @@ class ModelPlayground:
         controls_row2 = widgets.HBox([
             self.run_button,
             self.clear_button,
+            self.clear_cache_checkbox,
             self.compare_button,
             self.cost_display
         ])
@@ -162,9 +331,24 @@ class ModelPlayground:
             self.prompt_input,
             controls_row1,
             controls_row2,
+            self.stream_area,
             self.output_area
         ])
     
+    def _rebuild_model_outputs(self, change=None):
+        """Create one output pane per selected model, reusing panes that already exist."""
+        selected = list(self.model_selector.value)
+        self._per_model_outputs = {
+            model: self._per_model_outputs.get(model) or widgets.Output() for model in selected
+        }
+        self.stream_area.children = [
+            widgets.VBox(
+                [widgets.HTML(f'<b>🤖 {model}</b>'), output],
+                layout=widgets.Layout(width=f'{100 // len(selected)}%')
+            )
+            for model, output in self._per_model_outputs.items()
+        ]
+    
     def display(self):
         """Display the playground interface."""
         display(self.interface)
@@ -177,114 +361,395 @@ class ModelPlayground:
                 print("⚠️ Please select at least one model.")
             return
         
-        prompt = self.prompt_input.value.strip()
+        # Snapshot the prompt once; every model task shares this one string
+        prompt = (self.prompt_input.value or '').strip()
         if not prompt:
             with self.output_area:
                 clear_output()
                 print("⚠️ Please enter a prompt.")
             return
         
+        if len(prompt) > self.MAX_PROMPT_LENGTH:
+            with self.output_area:
+                clear_output()
+                print(f"⚠️ Prompt is too long ({len(prompt)} characters; "
+                      f"the limit is {self.MAX_PROMPT_LENGTH}).")
+            return
+        
+        # Interned so exact-cache key comparisons against repeat prompts are identity checks
+        prompt = sys.intern(prompt)
+        
         with self.output_area:
             clear_output()
             print("🔄 Running models...")
         
-        results = []
-        for model in self.model_selector.value:
+        models = list(self.model_selector.value)
+        temperature = self.temperature_slider.value
+        max_tokens = self.max_tokens_slider.value
+        
+        # Widget callbacks run inside the kernel's event loop, so schedule the
+        # fan-out there instead of blocking the frontend until every model returns.
+        # Without a running loop, fan out over the sync clients on a thread pool.
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._run_models_threaded(models, prompt, temperature, max_tokens)
+        else:
+            self._run_task = loop.create_task(
+                self._arun_models(models, prompt, temperature, max_tokens)
+            )
+    
+    async def _arun_models(self, models: List[str], prompt: str, temperature: float, max_tokens: int):
+        """Query all selected models concurrently and record their responses."""
+        embedding = None
+        if self.semantic_cache:
+            # Loading and running the local embedding model would block the kernel's loop
+            embedding = await asyncio.get_running_loop().run_in_executor(
+                _get_executor(), self._embed_prompt, prompt
+            )
+        
+        # Each model streams into its own pane so concurrent streams don't interleave
+        streams = dict(self._per_model_outputs)
+        
+        # Responses from one click share a single timestamp
+        batch_timestamp = datetime.now()
+        
+        # Disallow queuing more runs while this batch is in flight
+        self.run_button.disabled = True
+        try:
+            outcomes = await asyncio.gather(
+                *[self._aquery_model(model, prompt, temperature, max_tokens, batch_timestamp,
+                                     embedding, streams[model])
+                  for model in models],
+                return_exceptions=True
+            )
+        finally:
+            self.run_button.disabled = False
+        
+        self._record_results(zip(models, outcomes), streams)
+    
+    def _run_models_threaded(self, models: List[str], prompt: str, temperature: float, max_tokens: int):
+        """Query the selected models concurrently through the sync clients on the shared pool."""
+        embedding = self._embed_prompt(prompt) if self.semantic_cache else None
+        streams = dict(self._per_model_outputs)
+        batch_timestamp = datetime.now()
+        
+        outcomes = []
+        futures = {}
+        for model in models:
+            key = (model, prompt, round(temperature, 2), max_tokens)
+            cached = self._cached_response(key, embedding, prompt, batch_timestamp)
+            if cached is not None:
+                _replace_output(streams[model], cached.response)
+                outcomes.append((model, cached))
+                continue
+            future = _get_executor().submit(self._get_model_response, model, prompt, temperature, max_tokens)
+            futures[future] = (model, key)
+        
+        # Show each response as soon as its model finishes, fastest first
+        for future in as_completed(futures):
+            model, key = futures[future]
             try:
-                start_time = time.time()
-                response = self._get_model_response(
-                    model, 
-                    prompt, 
-                    self.temperature_slider.value,
-                    self.max_tokens_slider.value
-                )
-                end_time = time.time()
-                
-                # Estimate tokens and cost
-                tokens_used = len(response.split()) * 1.3  # Rough estimate
-                cost = self._estimate_cost(model, tokens_used)
-                
-                model_response = ModelResponse(
-                    model=model,
-                    prompt=prompt,
-                    response=response,
-                    timestamp=datetime.now(),
-                    tokens_used=int(tokens_used),
-                    cost_estimate=cost,
-                    response_time=end_time - start_time
-                )
-                
-                self.responses.append(model_response)
-                self.total_cost += cost
-                results.append(model_response)
-                
+                response, input_tokens, output_tokens, response_time = future.result()
             except Exception as e:
-                with self.output_area:
-                    print(f"❌ Error with {model}: {str(e)}")
+                outcomes.append((model, e))
+                continue
+            
+            _replace_output(streams[model], response)
+            model_response = self._make_response(model, prompt, batch_timestamp, response,
+                                                 input_tokens, output_tokens, response_time)
+            self._store_cache(key, model_response, embedding)
+            outcomes.append((model, model_response))
+        
+        self._record_results(outcomes, streams)
+    
+    def _record_results(self, outcomes, streams: Dict[str, widgets.Output]):
+        """Record each model's response (or report its error), then refresh the summary."""
+        results = []
+        for model, outcome in outcomes:
+            if isinstance(outcome, Exception):
+                _replace_output(streams[model], f"❌ Error with {model}: {str(outcome)}\n", 'stderr')
+                continue
+            
+            self.responses.append(outcome)
+            self.total_cost_micro += outcome.cost_micro
+            results.append(outcome)
+            
+            idx = self._MODEL_IDX[model]
+            self._usage_count[idx] += 1
+            self._usage_tokens[idx] += outcome.tokens_used
+            self._usage_cost_micro[idx] += outcome.cost_micro
+            self._usage_time[idx] += outcome.response_time
         
         self._display_results(results)
         self._update_cost_display()
     
-    def _get_model_response(self, model: str, prompt: str, temperature: float, max_tokens: int) -> str:
-        """Get response from a specific model."""
-        if model.startswith('gpt'):
-            response = self.clients['openai'].chat.completions.create(
-                model=model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=temperature,
-                max_tokens=max_tokens
-            )
-            return response.choices[0].message.content
-        
-        elif model.startswith('claude'):
-            response = self.clients['anthropic'].messages.create(
-                model=model.replace('claude-3-', 'claude-3-') + '-20240307',
-                max_tokens=max_tokens,
-                temperature=temperature,
-                messages=[{"role": "user", "content": prompt}]
+    async def _aquery_model(self, model: str, prompt: str, temperature: float, max_tokens: int,
+                            timestamp: datetime, embedding: Optional[np.ndarray] = None,
+                            stream: Optional[widgets.Output] = None) -> ModelResponse:
+        """Answer from the response cache if possible, otherwise call the model."""
+        key = (model, prompt, round(temperature, 2), max_tokens)
+        cached = self._cached_response(key, embedding, prompt, timestamp)
+        if cached is not None:
+            if stream is not None:
+                _replace_output(stream, cached.response)
+            return cached
+        
+        start_ns = time.perf_counter_ns()
+        try:
+            response, input_tokens, output_tokens = await self._aget_model_response(
+                model, prompt, temperature, max_tokens, stream
             )
-            return response.content[0].text
-        
-        elif model == 'gemini-pro':
-            response = self.clients['gemini'].generate_content(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=temperature,
-                    max_output_tokens=max_tokens
-                )
+        except asyncio.TimeoutError:
+            # Surfaced as an error, so a timeout never counts towards history or usage
+            elapsed = (time.perf_counter_ns() - start_ns) / 1e9
+            raise asyncio.TimeoutError(f"timed out after {elapsed:.1f}s") from None
+        response_time = (time.perf_counter_ns() - start_ns) / 1e9
+        
+        model_response = self._make_response(model, prompt, timestamp, response,
+                                             input_tokens, output_tokens, response_time)
+        self._store_cache(key, model_response, embedding)
+        return model_response
+    
+    def _make_response(self, model: str, prompt: str, timestamp: datetime, response: str,
+                       input_tokens: int, output_tokens: int, response_time: float) -> ModelResponse:
+        """Build a ModelResponse, pricing its token usage."""
+        cost_micro = self._estimate_cost_micro(model, input_tokens, output_tokens)
+        return ModelResponse(
+            model=model,
+            prompt=prompt,
+            response=response,
+            timestamp=timestamp,
+            tokens_used=input_tokens + output_tokens,
+            cost_estimate=cost_micro / 1_000_000,
+            cost_micro=cost_micro,
+            response_time=response_time
+        )
+    
+    def _cached_response(self, key: tuple, embedding: Optional[np.ndarray], prompt: str,
+                         timestamp: datetime) -> Optional[ModelResponse]:
+        """Return a cache hit re-stamped for this run (free and instant), if any."""
+        cached = self._lookup_cache(key, embedding)
+        if cached is None:
+            return None
+        return replace(cached, prompt=prompt, timestamp=timestamp,
+                       cost_estimate=0.0, cost_micro=0, response_time=0.0, cached=True)
+    
+    def _lookup_cache(self, key: tuple, embedding: Optional[np.ndarray]) -> Optional[ModelResponse]:
+        """Find a cached response by exact key, then by prompt similarity."""
+        cached = self._exact_cache.get(key)
+        if cached is not None:
+            self._exact_cache.move_to_end(key)
+            return cached
+        
+        # Semantic hits must share the (model, temperature, max_tokens) bucket
+        bucket = (key[0],) + key[2:]
+        candidates = [(emb, response) for entry_bucket, emb, response in self._embed_cache
+                      if entry_bucket == bucket]
+        if embedding is None or not candidates:
+            return None
+        
+        similarities = np.stack([emb for emb, _ in candidates]) @ embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] > self.SEMANTIC_THRESHOLD:
+            return candidates[best][1]
+        return None
+    
+    def _store_cache(self, key: tuple, response: ModelResponse, embedding: Optional[np.ndarray]):
+        """Insert a response into both cache tiers, evicting the oldest entries."""
+        self._exact_cache[key] = response
+        while len(self._exact_cache) > self.CACHE_MAX_ENTRIES:
+            self._exact_cache.popitem(last=False)
+        
+        if embedding is not None:
+            self._embed_cache.append(((key[0],) + key[2:], embedding, response))
+            del self._embed_cache[:-self.CACHE_MAX_ENTRIES]
+    
+    def _embed_prompt(self, prompt: str) -> Optional[np.ndarray]:
+        """Embed a prompt for the semantic cache tier (unit-normalized)."""
+        if self._embedder is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError:
+                self.semantic_cache = False
+                return None
+            self._embedder = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
+        return self._embedder.encode(prompt, normalize_embeddings=True)
+    
+    def clear_cache(self):
+        """Drop all cached model responses."""
+        self._exact_cache.clear()
+        self._embed_cache.clear()
+    
+    async def _aget_model_response(self, model: str, prompt: str, temperature: float, max_tokens: int,
+                                   stream: Optional[widgets.Output] = None) -> Tuple[str, int, int]:
+        """Stream a response from a specific model, returning (text, input tokens, output tokens).
+        
+        Chunks are appended to `stream` as they arrive, if given.
+        """
+        try:
+            call = self._dispatch[model]
+        except KeyError:
+            raise ValueError(f"Unknown model: {model}") from None
+        
+        parts = []
+        
+        def emit(text):
+            parts.append(text)
+            if stream is not None:
+                if len(parts) == 1:
+                    _replace_output(stream, text)
+                else:
+                    stream.append_stdout(text)
+        
+        async with self._sem:
+            usage = await asyncio.wait_for(
+                call(self.MODEL_IDS.get(model, model), prompt, temperature, max_tokens, emit),
+                timeout=self.REQUEST_TIMEOUT
             )
-            return response.text
+        text = ''.join(parts)
+        if usage is None:
+            return text, _count_tokens(prompt), _count_tokens(text)
+        return (text,) + usage
+    
+    async def _call_openai(self, model: str, prompt: str, temperature: float, max_tokens: int,
+                           emit: Callable[[str], None]) -> Optional[Tuple[int, int]]:
+        """Stream an OpenAI chat completion; returns the reported token usage."""
+        chunks = await self.aclients['openai'].chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        usage = None
+        async for chunk in chunks:
+            if chunk.choices and chunk.choices[0].delta.content:
+                emit(chunk.choices[0].delta.content)
+            if chunk.usage is not None:
+                usage = (chunk.usage.prompt_tokens, chunk.usage.completion_tokens)
+        return usage
+    
+    async def _call_anthropic(self, model: str, prompt: str, temperature: float, max_tokens: int,
+                              emit: Callable[[str], None]) -> Optional[Tuple[int, int]]:
+        """Stream an Anthropic message; returns the reported token usage."""
+        async with self.aclients['anthropic'].messages.stream(
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            messages=[{"role": "user", "content": prompt}]
+        ) as chunks:
+            async for text in chunks.text_stream:
+                emit(text)
+            message = await chunks.get_final_message()
+        return message.usage.input_tokens, message.usage.output_tokens
+    
+    async def _call_gemini(self, model: str, prompt: str, temperature: float, max_tokens: int,
+                           emit: Callable[[str], None]) -> Optional[Tuple[int, int]]:
+        """Stream a Gemini response; returns the reported token usage, if any."""
+        response = await self.aclients['gemini'].generate_content_async(
+            prompt,
+            generation_config=self._genai.types.GenerationConfig(
+                temperature=temperature,
+                max_output_tokens=max_tokens
+            ),
+            stream=True
+        )
+        async for chunk in response:
+            if chunk.text:
+                emit(chunk.text)
+        usage = getattr(response, 'usage_metadata', None)
+        if usage is None:
+            return None
+        return usage.prompt_token_count, usage.candidates_token_count
+    
+    def _get_model_response(self, model: str, prompt: str, temperature: float,
+                            max_tokens: int) -> Tuple[str, int, int, float]:
+        """Get (text, input tokens, output tokens, seconds) from a model via its sync client."""
+        try:
+            request = self._sync_dispatch[model]
+        except KeyError:
+            raise ValueError(f"Unknown model: {model}") from None
+        
+        start_ns = time.perf_counter_ns()
+        response, input_tokens, output_tokens = request(
+            self.MODEL_IDS.get(model, model), prompt, temperature, max_tokens
+        )
+        return response, input_tokens, output_tokens, (time.perf_counter_ns() - start_ns) / 1e9
+    
+    def _request_openai(self, model: str, prompt: str, temperature: float,
+                        max_tokens: int) -> Tuple[str, int, int]:
+        """Request an OpenAI chat completion through the sync client."""
+        response = self.clients['openai'].chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=self.REQUEST_TIMEOUT
+        )
+        return (response.choices[0].message.content,
+                response.usage.prompt_tokens, response.usage.completion_tokens)
+    
+    def _request_anthropic(self, model: str, prompt: str, temperature: float,
+                           max_tokens: int) -> Tuple[str, int, int]:
+        """Request an Anthropic message through the sync client."""
+        response = self.clients['anthropic'].messages.create(
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            messages=[{"role": "user", "content": prompt}],
+            timeout=self.REQUEST_TIMEOUT
+        )
+        return response.content[0].text, response.usage.input_tokens, response.usage.output_tokens
+    
+    def _request_gemini(self, model: str, prompt: str, temperature: float,
+                        max_tokens: int) -> Tuple[str, int, int]:
+        """Request a Gemini response through the sync client."""
+        response = self.clients['gemini'].generate_content(
+            prompt,
+            generation_config=self._genai.types.GenerationConfig(
+                temperature=temperature,
+                max_output_tokens=max_tokens
+            ),
+            request_options={'timeout': self.REQUEST_TIMEOUT}
+        )
+        usage = getattr(response, 'usage_metadata', None)
+        if usage is None:
+            return response.text, _count_tokens(prompt), _count_tokens(response.text)
+        return response.text, usage.prompt_token_count, usage.candidates_token_count
+    
+    def close(self):
+        """Close the shared HTTP connection pool."""
+        if self._http_finalizer is None:
+            return
         
-        else:
-            raise ValueError(f"Unknown model: {model}")
-    
-    def _estimate_cost(self, model: str, tokens: int) -> float:
-        """Estimate the cost for a model response."""
-        if model in self.COST_ESTIMATES:
-            # Assume 70% input, 30% output tokens
-            input_tokens = tokens * 0.7
-            output_tokens = tokens * 0.3
-            
-            cost_per_1k = self.COST_ESTIMATES[model]
-            input_cost = (input_tokens / 1000) * cost_per_1k['input']
-            output_cost = (output_tokens / 1000) * cost_per_1k['output']
-            
-            return input_cost + output_cost
-        return 0.0
+        self._http = None
+        # Calling a finalizer runs it at most once and detaches it
+        self._http_finalizer()
+    
+    def _estimate_cost_micro(self, model: str, input_tokens: int, output_tokens: int) -> int:
+        """Estimate the cost for a model response, in micro-dollars."""
+        idx = self._MODEL_IDX.get(model)
+        if idx is None:
+            return 0
+        input_rate, output_rate = self._RATES_MICRO[idx]
+        return (input_tokens * input_rate + output_tokens * output_rate + 500) // 1000
+    
+    @property
+    def total_cost(self) -> float:
+        """Total estimated cost of the session, in dollars."""
+        return self.total_cost_micro / 1_000_000
     
     def _display_results(self, results: List[ModelResponse]):
-        """Display the results from model runs."""
+        """Display the run summary; response text is already in the per-model panes."""
         with self.output_area:
-            clear_output()
+            clear_output(wait=True)
             
             for result in results:
-                print(f"\n{'='*60}")
-                print(f"🤖 Model: {result.model}")
-                print(f"⏱️ Response Time: {result.response_time:.2f}s")
-                print(f"🎯 Tokens: {result.tokens_used}")
-                print(f"💰 Cost: ${result.cost_estimate:.4f}")
-                print(f"{'='*60}")
-                print(f"\n{result.response}\n")
+                print(f"🤖 {result.model}{' (cached)' if result.cached else ''}: "
+                      f"⏱️ {result.response_time:.2f}s | 🎯 {result.tokens_used} tokens | "
+                      f"💰 ${result.cost_estimate:.4f}")
     
     def _compare_results(self, button):
         """Display a comparison of recent results."""
@@ -294,35 +759,49 @@ class ModelPlayground:
                 print("⚠️ Need at least 2 responses to compare. Run some models first!")
             return
         
-        # Get the most recent responses for comparison
-        recent_responses = self.responses[-min(len(self.responses), 4):]
+        # Nothing new since the last comparison: reuse the rendered table
+        key = (len(self.responses), id(self.responses[-1]))
+        if key != self._last_compare_key:
+            recent_responses = [self.responses[i] for i in range(-min(len(self.responses), 4), 0)]
+            self._last_compare_html = HTML(self._render_comparison(recent_responses))
+            self._last_compare_key = key
         
         with self.output_area:
             clear_output()
-            print("📊 MODEL COMPARISON")
-            print("=" * 80)
-            
-            # Summary table
-            print(f"{'Model':<20} {'Tokens':<10} {'Time (s)':<10} {'Cost ($)':<10}")
-            print("-" * 60)
-            
-            for response in recent_responses:
-                print(f"{response.model:<20} {response.tokens_used:<10} "
-                      f"{response.response_time:<10.2f} {response.cost_estimate:<10.4f}")
-            
-            print("\n" + "=" * 80)
-            
-            # Side-by-side responses
-            for i, response in enumerate(recent_responses, 1):
-                print(f"\n{i}. {response.model.upper()}")
-                print("-" * 40)
-                print(response.response[:200] + "..." if len(response.response) > 200 else response.response)
+            display(self._last_compare_html)
+    
+    @staticmethod
+    def _render_comparison(responses: List[ModelResponse]) -> str:
+        """Render the comparison summary table and response previews as HTML."""
+        parts = [
+            '<h3>📊 Model Comparison</h3>',
+            '<table><tr><th>Model</th><th>Tokens</th><th>Time (s)</th><th>Cost ($)</th></tr>'
+        ]
+        for response in responses:
+            parts.append(
+                f'<tr><td>{html.escape(response.model)}</td><td>{response.tokens_used}</td>'
+                f'<td>{response.response_time:.2f}</td><td>{response.cost_estimate:.4f}</td></tr>'
+            )
+        parts.append('</table>')
+        
+        for i, response in enumerate(responses, 1):
+            parts.append(
+                f'<h4>{i}. {html.escape(response.model.upper())}</h4>'
+                f'<pre style="white-space: pre-wrap;">{html.escape(response.preview)}</pre>'
+            )
+        return ''.join(parts)
     
     def _clear_history(self, button):
         """Clear the response history."""
         self.responses.clear()
-        self.total_cost = 0.0
+        self._reset_usage()
+        self.total_cost_micro = 0
         self._update_cost_display()
+        if self.clear_cache_checkbox.value:
+            self.clear_cache()
+        
+        for output in self._per_model_outputs.values():
+            output.clear_output()
         
         with self.output_area:
             clear_output()
@@ -340,43 +819,50 @@ class ModelPlayground:
         export_data = {
             'total_cost': self.total_cost,
             'total_responses': len(self.responses),
-            'responses': [asdict(response) for response in self.responses]
+            'responses': list(self.responses)
         }
         
-        # Convert datetime objects to strings
-        for response in export_data['responses']:
-            response['timestamp'] = response['timestamp'].isoformat()
-        
-        with open(filename, 'w') as f:
-            json.dump(export_data, f, indent=2)
+        # Responses are serialized in one pass, without per-response dict copies
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(export_data, default=_json_default, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w') as f:
+                json.dump(export_data, f, indent=2, default=_json_default)
         
         return filename
     
+    def _reset_usage(self):
+        """Zero the per-model usage arrays (one slot per known model)."""
+        n_models = len(self._MODEL_IDX)
+        self._usage_count = np.zeros(n_models, dtype=np.int64)
+        self._usage_tokens = np.zeros(n_models, dtype=np.int64)
+        self._usage_cost_micro = np.zeros(n_models, dtype=np.int64)
+        self._usage_time = np.zeros(n_models)
+    
     def get_usage_stats(self) -> Dict[str, Any]:
         """Get usage statistics."""
         if not self.responses:
             return {'message': 'No responses recorded yet.'}
         
+        # Per-model totals are accumulated as responses arrive; averages are one vector op
+        models = list(self._MODEL_IDX)
+        used = np.flatnonzero(self._usage_count)
+        counts = self._usage_count[used]
+        tokens = self._usage_tokens[used]
+        costs = self._usage_cost_micro[used] / 1_000_000
+        avg_times = self._usage_time[used] / counts
+        avg_tokens = tokens / counts
+        
         model_stats = {}
-        for response in self.responses:
-            if response.model not in model_stats:
-                model_stats[response.model] = {
-                    'count': 0,
-                    'total_tokens': 0,
-                    'total_cost': 0.0,
-                    'avg_response_time': 0.0
-                }
-            
-            stats = model_stats[response.model]
-            stats['count'] += 1
-            stats['total_tokens'] += response.tokens_used
-            stats['total_cost'] += response.cost_estimate
-            stats['avg_response_time'] += response.response_time
-        
-        # Calculate averages
-        for model, stats in model_stats.items():
-            stats['avg_response_time'] /= stats['count']
-            stats['avg_tokens_per_response'] = stats['total_tokens'] / stats['count']
+        for i, idx in enumerate(used):
+            model_stats[models[idx]] = {
+                'count': int(counts[i]),
+                'total_tokens': int(tokens[i]),
+                'total_cost': float(costs[i]),
+                'avg_response_time': float(avg_times[i]),
+                'avg_tokens_per_response': float(avg_tokens[i])
+            }
         
         return {
             'total_responses': len(self.responses),
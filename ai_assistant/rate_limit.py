@@ -0,0 +1,76 @@
+"""
+Client-side rate limiting for AI provider calls.
+
+Keeps concurrent requests under each provider's requests-per-minute (RPM) and
+tokens-per-minute (TPM) limits so that fan-out does not trigger 429 responses.
+"""
+
+import os
+import time
+import asyncio
+from typing import Dict
+
+
+# Default per-provider limits; override with AI_ASSIST_<PROVIDER>_{CONCURRENCY,RPM,TPM}
+PROVIDER_LIMITS = {
+    'openai': {'concurrency': 50, 'rpm': 500, 'tpm': 200000},
+    'anthropic': {'concurrency': 20, 'rpm': 50, 'tpm': 50000},
+    'gemini': {'concurrency': 50, 'rpm': 60, 'tpm': 120000},
+}
+
+
+class TokenBucket:
+    """Async token bucket that refills continuously at a per-minute rate."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, tokens: int = 1):
+        """Wait until `tokens` are available, then consume them."""
+        tokens = min(float(tokens), self.capacity)
+        while True:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return
+            await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+
+def get_provider_limits(provider: str) -> Dict[str, int]:
+    """Get the limits for a provider, applying any environment overrides."""
+    limits = dict(PROVIDER_LIMITS[provider])
+    for name in limits:
+        value = os.getenv(f'AI_ASSIST_{provider.upper()}_{name.upper()}')
+        if value:
+            limits[name] = int(value)
+    return limits
+
+
+class ProviderLimiter:
+    """Concurrency semaphore plus RPM/TPM token buckets for one provider."""
+
+    def __init__(self, provider: str):
+        limits = get_provider_limits(provider)
+        self.semaphore = asyncio.Semaphore(limits['concurrency'])
+        self.requests = TokenBucket(limits['rpm'])
+        self.tokens = TokenBucket(limits['tpm'])
+
+    async def __aenter__(self):
+        await self.semaphore.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.semaphore.release()
+
+    async def acquire(self, prompt: str):
+        """Reserve one request and an approximate token count for a prompt."""
+        await self.requests.acquire(1)
+        await self.tokens.acquire(len(prompt) // 4)
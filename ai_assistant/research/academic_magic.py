@@ -5,24 +5,274 @@ Specialized IPython magic commands for academic researchers.
 """
 
 import os
-import pandas as pd
+import gzip
+import asyncio
+import threading
+import importlib.util
 import numpy as np
 from pathlib import Path
 from IPython.core.magic import Magics, magics_class, line_magic, cell_magic
 from IPython.core.magic_arguments import (argument, magic_arguments, parse_argstring)
-from IPython.display import display, HTML, Markdown
-import matplotlib.pyplot as plt
-import seaborn as sns
+from IPython.display import display, HTML, Markdown, Image
+
+# FireDucks is a compiled, multithreaded drop-in for pandas; opt in with AI_ASSIST_USE_FIREDUCKS=true
+FIREDUCKS_AVAILABLE = False
+if os.getenv('AI_ASSIST_USE_FIREDUCKS', 'false').lower() in ('1', 'true'):
+    try:
+        import fireducks.pandas as pd
+        FIREDUCKS_AVAILABLE = True
+    except ImportError:
+        pass
+if not FIREDUCKS_AVAILABLE:
+    import pandas as pd
+
+# Heavy plotting/report libraries (matplotlib, sweetviz, scipy, numba) are imported
+# where they are used, so loading the extension stays fast
+SWEETVIZ_AVAILABLE = importlib.util.find_spec('sweetviz') is not None
 
 try:
-    import sweetviz as sv
-    SWEETVIZ_AVAILABLE = True
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.compute as pc
+    PYARROW_AVAILABLE = True
 except ImportError:
-    SWEETVIZ_AVAILABLE = False
+    PYARROW_AVAILABLE = False
 
 from ..magic_commands import AIAssistantMagics
 
 
+# Above this many rows, duplicates are found by comparing 64-bit row hashes
+_HASH_DUPLICATES_MIN_ROWS = 50_000
+
+# Files at least this large stay Arrow-backed instead of being converted to NumPy blocks
+_ARROW_BACKED_MIN_BYTES = 256 * 1024 * 1024
+
+# Reports longer than this many characters are saved gzip-compressed
+_REPORT_GZIP_MIN_CHARS = 100_000
+
+# Correlation heatmaps only get per-cell labels up to this many variables
+_HEATMAP_ANNOTATE_MAX = 20
+
+# SweetViz draws through pyplot, whose global figure state is not thread-safe, so
+# background reports are built one at a time. The magics' own plots use standalone
+# Figure objects instead of pyplot and never wait on this.
+_SWEETVIZ_LOCK = threading.Lock()
+
+
+def _show_figure(fig):
+    """Render a standalone matplotlib Figure to PNG and display it."""
+    import io
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    
+    buffer = io.BytesIO()
+    FigureCanvasAgg(fig).print_png(buffer)
+    display(Image(data=buffer.getvalue(), format='png'))
+
+
+# HTML templates for result lists; each list is rendered into one display() call
+_PAPER_TMPL = """
+<div style="background: #f8f9fa; padding: 15px; margin: 10px 0; border-radius: 5px; border-left: 4px solid #007bff;">
+    <h5>{index}. {title}</h5>
+    <p><strong>Authors:</strong> {authors}</p>
+    <p><strong>Published:</strong> {published}</p>
+    <p><strong>Summary:</strong> {summary}</p>
+    <p><strong>URL:</strong> <a href="{url}" target="_blank">View Paper</a></p>
+</div>
+"""
+
+_DATASET_TMPL = """
+<div style="background: #e8f5e8; padding: 15px; margin: 10px 0; border-radius: 5px;">
+    <h4>{index}. {name}</h4>
+    <p><strong>Description:</strong> {description}</p>
+    <p><strong>Size:</strong> {size} instances</p>
+    <p><strong>Features:</strong> {attributes} attributes</p>
+    <p><strong>Domain:</strong> {domain}</p>
+    {link}
+</div>
+"""
+
+_INDICATOR_TMPL = """
+<div style="background: #f0f8ff; padding: 10px; margin: 5px 0; border-radius: 3px;">
+    <strong>{code}</strong>: {name}
+</div>
+"""
+
+
+def _truncate(text: pd.Series, width: int) -> pd.Series:
+    """Cut strings longer than width and mark them with an ellipsis."""
+    return text.where(text.str.len() <= width, text.str.slice(0, width) + '...')
+
+
+def _render_papers(papers) -> str:
+    """Render a list of paper records with _PAPER_TMPL."""
+    records = pd.DataFrame.from_records(papers)
+    
+    def column(name, default):
+        if name not in records:
+            return pd.Series(default, index=records.index)
+        return records[name].fillna(default)
+    
+    # Truncation runs once over each column instead of per paper
+    authors = column('authors', '').map(lambda names: ', '.join(names) if names else 'Unknown')
+    fields = pd.DataFrame({
+        'index': range(1, len(records) + 1),
+        'title': column('title', 'Unknown Title'),
+        'authors': _truncate(authors, 100),
+        'published': column('published', 'Unknown'),
+        'summary': _truncate(column('summary', 'No summary available'), 200),
+        'url': column('url', '#'),
+    })
+    return ''.join(_PAPER_TMPL.format(**row._asdict()) for row in fields.itertuples(index=False))
+
+
+def _render_datasets(datasets) -> str:
+    """Render a list of dataset records with _DATASET_TMPL."""
+    return ''.join(
+        _DATASET_TMPL.format(
+            index=i,
+            name=dataset.get('name', dataset.get('title', 'Unknown Dataset')),
+            description=dataset.get('description', 'No description available'),
+            size=dataset.get('instances', dataset.get('size', 'Unknown')),
+            attributes=dataset.get('attributes', 'Unknown'),
+            domain=dataset.get('area', dataset.get('domain', 'General')),
+            link=(f'<p><strong>URL:</strong> <a href="{dataset["url"]}" target="_blank">Access Dataset</a></p>'
+                  if dataset.get('url') else ''),
+        )
+        for i, dataset in enumerate(datasets, 1)
+    )
+
+
+def _arrow_convert_options():
+    """CSV conversion options shared by the Arrow readers."""
+    # Empty string cells are missing values, as with pandas
+    return pa_csv.ConvertOptions(strings_can_be_null=True)
+
+
+def _load_arrow(path):
+    """Stream a CSV into an Arrow table batch by batch, or return None if Arrow can't parse it."""
+    try:
+        reader = pa_csv.open_csv(path, convert_options=_arrow_convert_options())
+        return reader.read_all()
+    except pa.ArrowInvalid:
+        return None
+
+
+def _arrow_describe(table, columns) -> pd.DataFrame:
+    """describe() for numeric columns, computed by pyarrow.compute on the Arrow buffers."""
+    stats = {}
+    for name in columns:
+        col = table.column(name)
+        extremes = pc.min_max(col)
+        stats[name] = [
+            pc.count(col).as_py(),
+            pc.mean(col).as_py(),
+            pc.stddev(col, ddof=1).as_py(),
+            extremes['min'].as_py(),
+            *pc.quantile(col, q=[0.25, 0.5, 0.75]).to_pylist(),
+            extremes['max'].as_py(),
+        ]
+    index = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+    return pd.DataFrame(stats, index=index, dtype=np.float64)
+
+
+def _arrow_strings(df: pd.DataFrame) -> pd.DataFrame:
+    """Store all-string object columns as Arrow strings; mixed columns stay object."""
+    object_cols = df.select_dtypes(include=['object']).columns
+    if not PYARROW_AVAILABLE or len(object_cols) == 0:
+        return df
+    converted = df[object_cols].convert_dtypes(
+        dtype_backend='pyarrow', convert_integer=False, convert_boolean=False, convert_floating=False
+    )
+    df = df.copy(deep=False)
+    df[object_cols] = converted
+    return df
+
+
+def _read_csv_fast(path, chunksize=None) -> pd.DataFrame:
+    """Read a CSV with Arrow's multithreaded parser, falling back to pandas' C engine."""
+    if chunksize:
+        # Parse in bounded chunks so the tokenizer never holds the whole file at once
+        return _arrow_strings(pd.concat(pd.read_csv(path, chunksize=chunksize), ignore_index=True))
+    
+    if PYARROW_AVAILABLE:
+        try:
+            table = pa_csv.read_csv(path, convert_options=_arrow_convert_options())
+        except pa.ArrowInvalid:
+            # Files Arrow can't parse (e.g. ragged rows) still load through pandas
+            pass
+        else:
+            # Numeric columns become NumPy blocks; text stays in Arrow string buffers
+            # rather than being materialized as Python objects
+            string_dtype = pd.ArrowDtype(pa.string())
+            return table.to_pandas(
+                split_blocks=True, self_destruct=True,
+                types_mapper={pa.string(): string_dtype}.get
+            )
+    
+    return _arrow_strings(pd.read_csv(path))
+
+
+def _downcast_numeric(df: pd.DataFrame):
+    """Downcast numeric columns to the smallest dtype that holds them; returns (df, bytes saved)."""
+    # Only numeric columns change, so the shallow memory count gives the exact saving
+    before = df.memory_usage(index=False).sum()
+    df = df.copy(deep=False)
+    for col in df.select_dtypes('float').columns:
+        df[col] = pd.to_numeric(df[col], downcast='float')
+    for col in df.select_dtypes('integer').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df, int(before - df.memory_usage(index=False).sum())
+
+
+def _write_report(name: str, text: str) -> Path:
+    """Write a report in one call, gzipping large ones, and atomically replace any old copy."""
+    data = text.encode('utf-8')
+    path = Path(name)
+    if len(text) > _REPORT_GZIP_MIN_CHARS:
+        data = gzip.compress(data)
+        path = path.with_name(path.name + '.gz')
+    
+    # Readers never see a half-written file
+    tmp_path = path.with_name(f'.{path.name}.tmp')
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _count_duplicates(df: pd.DataFrame) -> int:
+    """Count duplicate rows, via vectorized row fingerprints on large frames."""
+    if len(df) > _HASH_DUPLICATES_MIN_ROWS:
+        row_hash = pd.util.hash_pandas_object(df, index=False)
+        return int(row_hash.duplicated().sum())
+    return int(df.duplicated().sum())
+
+
+def _correlation_tests(X: np.ndarray):
+    """Pairwise-complete Pearson r, two-sided p-values and sample sizes for every column pair."""
+    from scipy.stats import t as t_dist
+    
+    present = ~np.isnan(X)
+    M = present.astype(np.float64)
+    # Center each column first so the sums below stay well conditioned
+    Z = np.where(present, X - np.nanmean(X, axis=0), 0.0)
+    
+    # Every pairwise sum comes out of a handful of matrix products
+    n = M.T @ M
+    sum_x = Z.T @ M
+    sum_xx = (Z * Z).T @ M
+    sum_xy = Z.T @ Z
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = sum_xy - sum_x * sum_x.T / n
+        var_x = sum_xx - sum_x ** 2 / n
+        r = np.clip(cov / np.sqrt(var_x * var_x.T), -1.0, 1.0)
+        dof = n - 2
+        t_stat = r * np.sqrt(dof / (1.0 - r ** 2))
+        p = 2 * t_dist.sf(np.abs(t_stat), np.where(dof > 0, dof, np.nan))
+    
+    return r, p, n.astype(np.int64)
+
+
 @magics_class
 class AcademicResearchMagics(AIAssistantMagics):
     """Academic research-focused magic commands."""
@@ -32,58 +282,140 @@ class AcademicResearchMagics(AIAssistantMagics):
         self.research_context = {}
         self.current_dataset = None
         self.research_question = None
+        # Derived results (describe, corr, ...) for the dataset object in _cache_owner
+        self._cache = {}
+        self._cache_owner = None
+    
+    def _cached(self, name, compute):
+        """Return a memoized result for the current dataset, recomputing when it changes."""
+        if self._cache_owner is not self.current_dataset:
+            # Loading or cleaning always assigns a new frame, which drops stale entries
+            self._cache = {}
+            self._cache_owner = self.current_dataset
+        if name not in self._cache:
+            self._cache[name] = compute()
+        return self._cache[name]
+    
+    def _submit_ai_request(self, prompt: str, temperature: float):
+        """Start an AI request on the background loop; call .result() on the returned future."""
+        return asyncio.run_coroutine_threadsafe(
+            self._get_ai_response_async(prompt, 'auto', temperature), self._loop
+        )
+    
+    async def _build_sweetviz_report(self, df, handle, path='research_eda_report.html'):
+        """Generate a SweetViz report off the kernel thread and update its placeholder."""
+        def build():
+            import sweetviz as sv
+            with _SWEETVIZ_LOCK:
+                sv.analyze(df).show_html(path, open_browser=False)
+        
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, build)
+        except Exception as e:
+            handle.update(HTML(f'<div style="color: orange;">SweetViz report failed: {str(e)}</div>'))
+            return
+        
+        handle.update(HTML(f"""
+        <div style="background: #d4edda; padding: 15px; border-radius: 5px; margin: 10px 0;">
+            <p>📄 <strong>SweetViz report generated:</strong> <a href="{path}" target="_blank"><code>{path}</code></a></p>
+            <p>Open this file in your browser for interactive exploration.</p>
+        </div>
+        """))
+    
+    def _column_groups(self):
+        """Numeric and categorical column names of the current dataset (memoized)."""
+        df = self.current_dataset
+        numeric_cols = self._cached('numeric_cols', lambda: df.select_dtypes(include=[np.number]).columns)
+        categorical_cols = self._cached('categorical_cols', lambda: df.select_dtypes(include=['object', 'string', 'category']).columns)
+        return numeric_cols, categorical_cols
+    
+    def _arrow_table(self):
+        """Arrow table backing the current dataset, or None once it has been replaced."""
+        return self._cached('arrow_table', lambda: None)
+    
+    def _describe(self):
+        """Summary statistics, read straight from the Arrow buffers when available."""
+        table = self._arrow_table()
+        numeric_cols, _ = self._column_groups()
+        if table is not None and len(numeric_cols) > 0:
+            return _arrow_describe(table, numeric_cols)
+        return self.current_dataset.describe()
+    
+    def _correlation_matrix(self):
+        """Pearson correlations between the numeric columns."""
+        numeric_cols, _ = self._column_groups()
+        table = self._arrow_table()
+        if table is None:
+            X = self.current_dataset[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            # Null-free numeric Arrow columns convert to NumPy without a copy
+            X = np.column_stack([
+                table.column(name).to_numpy().astype(np.float64, copy=False) for name in numeric_cols
+            ])
+        # Multithreaded BLAS products rather than pandas' single-threaded pairwise loop
+        r, _, _ = _correlation_tests(X)
+        return pd.DataFrame(r, index=numeric_cols, columns=numeric_cols)
     
     @line_magic
     @magic_arguments()
     @argument('filepath', help='Path to CSV file')
     @argument('--research_question', '-q', help='Research question to guide analysis')
     @argument('--target_variable', '-t', help='Target variable for analysis')
+    @argument('--chunksize', '-c', type=int, help='Read the file in chunks of this many rows')
+    @argument('--arrow', '-a', action='store_true',
+              help='Keep the data Arrow-backed (automatic for very large files)')
+    @argument('--downcast', '-d', action='store_true',
+              help='Store numeric columns as float32/smaller integers to save memory')
     def research_load(self, line):
         """Load research data and perform initial analysis."""
         args = parse_argstring(self.research_load, line)
         
         try:
             # Load data
-            df = pd.read_csv(args.filepath)
+            table = None
+            if PYARROW_AVAILABLE and not args.chunksize and (
+                args.arrow or (os.path.isfile(args.filepath)
+                               and os.path.getsize(args.filepath) >= _ARROW_BACKED_MIN_BYTES)
+            ):
+                table = _load_arrow(args.filepath)
+            
+            if table is not None:
+                # Columns stay in Arrow memory; pandas only wraps them
+                df = table.to_pandas(types_mapper=pd.ArrowDtype)
+            else:
+                df = _read_csv_fast(args.filepath, args.chunksize)
+            
+            bytes_saved = None
+            if args.downcast:
+                df, bytes_saved = _downcast_numeric(df)
+                # The downcast columns no longer share the Arrow buffers
+                table = None
             self.current_dataset = df
             
+            if table is not None:
+                self._cached('arrow_table', lambda: table)
+                # Arrow tracks null counts per column, so no scan is needed
+                self._cached('null_counts', lambda: pd.Series(
+                    [column.null_count for column in table.columns], index=df.columns
+                ))
+            
             # Store research context
             if args.research_question:
                 self.research_question = args.research_question
             
-            # Display basic info
-            display(HTML(f"""
-            <div style="background: #e8f5e8; padding: 15px; border-radius: 5px; margin: 10px 0;">
-                <h3>📊 Dataset Loaded Successfully</h3>
-                <p><strong>File:</strong> {args.filepath}</p>
-                <p><strong>Shape:</strong> {df.shape[0]} rows × {df.shape[1]} columns</p>
-                {f'<p><strong>Research Question:</strong> {args.research_question}</p>' if args.research_question else ''}
-            </div>
-            """))
-            
-            # Show data preview
-            display(HTML("<h4>Data Preview:</h4>"))
-            display(df.head())
-            
-            # Show data types and missing values
-            info_df = pd.DataFrame({
-                'Column': df.columns,
-                'Data Type': df.dtypes,
-                'Missing Values': df.isnull().sum(),
-                'Missing %': (df.isnull().sum() / len(df) * 100).round(2)
-            })
+            # Data types and missing values (one null sweep, reused below)
+            dtypes = df.dtypes
+            null_counts = self._cached('null_counts', df.isna().sum)
             
-            display(HTML("<h4>Data Quality Summary:</h4>"))
-            display(info_df)
-            
-            # AI-powered initial insights
+            # Start the AI request first so it runs while the tables render
+            insights = None
             if self.clients:
                 insights_prompt = f"""
                 Analyze this dataset for academic research:
                 - Dataset shape: {df.shape}
                 - Columns: {list(df.columns)}
-                - Data types: {dict(df.dtypes)}
-                - Missing values: {dict(df.isnull().sum())}
+                - Data types: {dict(dtypes)}
+                - Missing values: {null_counts.to_dict()}
                 {f'- Research question: {args.research_question}' if args.research_question else ''}
                 
                 Provide:
@@ -92,9 +424,38 @@ class AcademicResearchMagics(AIAssistantMagics):
                 3. Recommended analysis approaches
                 4. Potential research insights to explore
                 """
-                
+                insights = self._submit_ai_request(insights_prompt, 0.3)
+            
+            # Show data types and missing values; the columns are already aligned
+            # arrays, so the frame wraps them without reindexing or copying
+            nulls = null_counts.to_numpy()
+            info_df = pd.DataFrame({
+                'Column': df.columns.to_numpy(),
+                'Data Type': dtypes.to_numpy(),
+                'Missing Values': nulls,
+                'Missing %': (nulls * (100.0 / max(len(df), 1))).round(2)
+            }, index=df.columns, copy=False)
+            
+            # Basic info, preview and quality summary go out as one HTML message;
+            # both tables are bounded so very wide frames stay renderable
+            display(HTML(f"""
+            <div style="background: #e8f5e8; padding: 15px; border-radius: 5px; margin: 10px 0;">
+                <h3>📊 Dataset Loaded Successfully</h3>
+                <p><strong>File:</strong> {args.filepath}</p>
+                <p><strong>Shape:</strong> {df.shape[0]} rows × {df.shape[1]} columns</p>
+                {f'<p><strong>Downcast:</strong> saved {bytes_saved / 1024 ** 2:.2f} MB</p>' if bytes_saved is not None else ''}
+                {f'<p><strong>Research Question:</strong> {args.research_question}</p>' if args.research_question else ''}
+            </div>
+            <h4>Data Preview:</h4>
+            {df.head().to_html(max_cols=20, border=0)}
+            <h4>Data Quality Summary:</h4>
+            {info_df.to_html(max_rows=pd.get_option('display.max_rows'), border=0)}
+            """))
+            
+            # AI-powered initial insights
+            if insights is not None:
                 try:
-                    response = self._get_ai_response(insights_prompt, 'auto', 0.3)
+                    response = insights.result()
                     display(Markdown(f"**🤖 AI Research Assistant Insights:**\n\n{response}"))
                 except Exception as e:
                     display(HTML(f'<div style="color: orange;">AI insights unavailable: {str(e)}</div>'))
@@ -113,7 +474,8 @@ class AcademicResearchMagics(AIAssistantMagics):
             display(HTML('<div style="color: red;">No dataset loaded. Use %research_load first.</div>'))
             return
         
-        df = self.current_dataset.copy()
+        # Diagnostics only read the dataset; the cleaning magics below copy when they modify it
+        df = self.current_dataset
         
         display(HTML("<h3>🧹 AI-Guided Data Cleaning</h3>"))
         
@@ -121,18 +483,18 @@ class AcademicResearchMagics(AIAssistantMagics):
         issues = []
         
         # Missing values
-        missing_cols = df.columns[df.isnull().any()].tolist()
+        null_counts = self._cached('null_counts', df.isna().sum)
+        missing_cols = null_counts.index[null_counts > 0].tolist()
         if missing_cols:
             issues.append(f"Missing values in: {missing_cols}")
         
         # Potential duplicates
-        duplicates = df.duplicated().sum()
+        duplicates = self._cached('duplicates', lambda: _count_duplicates(df))
         if duplicates > 0:
             issues.append(f"Potential duplicate rows: {duplicates}")
         
         # Data type issues
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        categorical_cols = df.select_dtypes(include=['object']).columns
+        numeric_cols, categorical_cols = self._column_groups()
         
         if len(issues) == 0:
             display(HTML('<div style="color: green;">✅ No major data quality issues detected!</div>'))
@@ -176,57 +538,125 @@ class AcademicResearchMagics(AIAssistantMagics):
         """))
     
     @line_magic
-    def research_eda(self, line):
-        """Generate comprehensive exploratory data analysis."""
+    @magic_arguments()
+    @argument('--strategy', '-s', choices=['drop', 'mean', 'median', 'mode'], default='drop',
+              help='How to handle missing values (default: drop rows)')
+    def research_clean_missing(self, line):
+        """Handle missing values in the current dataset."""
+        args = parse_argstring(self.research_clean_missing, line)
+        
+        if self.current_dataset is None:
+            display(HTML('<div style="color: red;">No dataset loaded. Use %research_load first.</div>'))
+            return
+        
+        missing_before = int(self._cached('null_counts', self.current_dataset.isna().sum).sum())
+        df = self.current_dataset.copy(deep=False)
+        
+        if args.strategy == 'drop':
+            df = df.dropna()
+        else:
+            numeric_cols = df.select_dtypes(include=[np.number]).columns
+            if args.strategy == 'mode':
+                fill_values = df.mode().iloc[0] if len(df) else pd.Series(dtype=object)
+            elif args.strategy == 'mean':
+                fill_values = df[numeric_cols].mean()
+            else:
+                fill_values = df[numeric_cols].median()
+            df = df.fillna(fill_values)
+        
+        self.current_dataset = df
+        missing_after = int(df.isna().sum().sum())
+        
+        display(HTML(f"""
+        <div style="background: #d4edda; padding: 15px; border-radius: 5px; margin: 10px 0;">
+            <p>✅ <strong>Missing values handled ({args.strategy}):</strong> {missing_before} → {missing_after}</p>
+            <p><strong>Shape:</strong> {df.shape[0]} rows × {df.shape[1]} columns</p>
+        </div>
+        """))
+    
+    @line_magic
+    def research_clean_duplicates(self, line):
+        """Remove duplicate rows from the current dataset."""
+        if self.current_dataset is None:
+            display(HTML('<div style="color: red;">No dataset loaded. Use %research_load first.</div>'))
+            return
+        
+        df = self.current_dataset.copy(deep=False)
+        rows_before = len(df)
+        df = df.drop_duplicates(ignore_index=True)
+        self.current_dataset = df
+        
+        display(HTML(f"""
+        <div style="background: #d4edda; padding: 15px; border-radius: 5px; margin: 10px 0;">
+            <p>✅ <strong>Duplicates removed:</strong> {rows_before - len(df)} rows</p>
+            <p><strong>Shape:</strong> {df.shape[0]} rows × {df.shape[1]} columns</p>
+        </div>
+        """))
+    
+    @line_magic
+    @magic_arguments()
+    @argument('--method', '-m', choices=['iqr', 'zscore'], default='iqr',
+              help='Outlier rule: IQR fences or z-score (default: iqr)')
+    @argument('--threshold', '-t', type=float,
+              help='IQR multiplier or z-score cutoff (default: 1.5 for iqr, 3 for zscore)')
+    @argument('--remove', '-r', action='store_true', help='Drop rows containing outliers')
+    def research_clean_outliers(self, line):
+        """Detect (and optionally remove) outliers in numeric columns."""
+        args = parse_argstring(self.research_clean_outliers, line)
+        
         if self.current_dataset is None:
             display(HTML('<div style="color: red;">No dataset loaded. Use %research_load first.</div>'))
             return
         
         df = self.current_dataset
+        numeric_cols, _ = self._column_groups()
+        if len(numeric_cols) == 0:
+            display(HTML('<div style="color: orange;">No numeric columns to check for outliers.</div>'))
+            return
         
-        display(HTML("<h3>📊 Exploratory Data Analysis</h3>"))
+        threshold = args.threshold if args.threshold is not None else (1.5 if args.method == 'iqr' else 3.0)
+        from ._kernels import iqr_mask, zscore_mask
         
-        # SweetViz report if available
-        if SWEETVIZ_AVAILABLE:
-            try:
-                display(HTML("<h4>🍭 SweetViz Automated Report</h4>"))
-                report = sv.analyze(df)
-                report.show_html('research_eda_report.html', open_browser=False)
-                
-                display(HTML("""
-                <div style="background: #d4edda; padding: 15px; border-radius: 5px; margin: 10px 0;">
-                    <p>📄 <strong>SweetViz report generated:</strong> <code>research_eda_report.html</code></p>
-                    <p>Open this file in your browser for interactive exploration.</p>
-                </div>
-                """))
-                
-            except Exception as e:
-                display(HTML(f'<div style="color: orange;">SweetViz report failed: {str(e)}</div>'))
+        # One contiguous row per column for the per-column kernels
+        values = np.ascontiguousarray(
+            df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan).T
+        )
+        if args.method == 'iqr':
+            mask = iqr_mask(values, threshold)
         else:
-            display(HTML("""
-            <div style="background: #fff3cd; padding: 15px; border-radius: 5px; margin: 10px 0;">
-                <p>💡 <strong>Tip:</strong> Install SweetViz for automated EDA reports:</p>
-                <code>pip install sweetviz</code>
+            mask = zscore_mask(values, threshold)
+        
+        counts = pd.Series(mask.sum(axis=1), index=numeric_cols)
+        display(HTML(f"<h4>📍 Outliers by column ({args.method}, threshold {threshold:g})</h4>"))
+        display(counts[counts > 0].to_frame('Outliers'))
+        
+        if args.remove:
+            df = df.copy(deep=False)[~mask.any(axis=0)]
+            rows_removed = len(self.current_dataset) - len(df)
+            self.current_dataset = df
+            display(HTML(f"""
+            <div style="background: #d4edda; padding: 15px; border-radius: 5px; margin: 10px 0;">
+                <p>✅ <strong>Rows with outliers removed:</strong> {rows_removed}</p>
+                <p><strong>Shape:</strong> {df.shape[0]} rows × {df.shape[1]} columns</p>
             </div>
             """))
+    
+    @line_magic
+    def research_eda(self, line):
+        """Generate comprehensive exploratory data analysis."""
+        if self.current_dataset is None:
+            display(HTML('<div style="color: red;">No dataset loaded. Use %research_load first.</div>'))
+            return
         
-        # Basic statistical summary
-        display(HTML("<h4>📈 Statistical Summary</h4>"))
-        display(df.describe())
+        df = self.current_dataset
         
-        # Correlation analysis for numeric variables
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        if len(numeric_cols) > 1:
-            display(HTML("<h4>🔗 Correlation Analysis</h4>"))
-            
-            plt.figure(figsize=(10, 8))
-            correlation_matrix = df[numeric_cols].corr()
-            sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', center=0)
-            plt.title('Variable Correlations')
-            plt.tight_layout()
-            plt.show()
+        display(HTML("<h3>📊 Exploratory Data Analysis</h3>"))
         
-        # AI-powered insights
+        summary = self._cached('describe', self._describe)
+        numeric_cols, categorical_cols = self._column_groups()
+        
+        # Start the AI request first so it runs while the local reports render
+        insights = None
         if self.clients:
             eda_prompt = f"""
             Analyze this dataset for academic research insights:
@@ -234,8 +664,8 @@ class AcademicResearchMagics(AIAssistantMagics):
             Dataset overview:
             - Shape: {df.shape}
             - Numeric variables: {list(numeric_cols)}
-            - Categorical variables: {list(df.select_dtypes(include=['object']).columns)}
-            - Statistical summary: {df.describe().to_string()}
+            - Categorical variables: {list(categorical_cols)}
+            - Statistical summary: {summary.to_string()}
             {f'- Research question: {self.research_question}' if self.research_question else ''}
             
             Provide:
@@ -245,9 +675,61 @@ class AcademicResearchMagics(AIAssistantMagics):
             4. Potential research hypotheses to test
             5. Variables that might need transformation
             """
+            insights = self._submit_ai_request(eda_prompt, 0.4)
+        
+        # SweetViz report if available
+        if SWEETVIZ_AVAILABLE:
+            # The report can take a while on larger data, so it is built in the
+            # background and the placeholder is filled in when it finishes
+            display(HTML("<h4>🍭 SweetViz Automated Report</h4>"))
+            handle = display(HTML('<div>⏳ Generating SweetViz report in the background...</div>'), display_id=True)
+            # A copy, so edits to the frame in later cells cannot race the report
+            asyncio.run_coroutine_threadsafe(self._build_sweetviz_report(df.copy(), handle), self._loop)
+        else:
+            display(HTML("""
+            <div style="background: #fff3cd; padding: 15px; border-radius: 5px; margin: 10px 0;">
+                <p>💡 <strong>Tip:</strong> Install SweetViz for automated EDA reports:</p>
+                <code>pip install sweetviz</code>
+            </div>
+            """))
+        
+        # Basic statistical summary
+        display(HTML("<h4>📈 Statistical Summary</h4>"))
+        display(summary)
+        
+        # Correlation analysis for numeric variables
+        if len(numeric_cols) > 1:
+            display(HTML("<h4>🔗 Correlation Analysis</h4>"))
+            
+            from matplotlib.figure import Figure
+            
+            correlation_matrix = self._cached('corr', self._correlation_matrix)
+            C = correlation_matrix.to_numpy()
+            k = len(numeric_cols)
+            
+            # A single raster image rather than one patch per cell; a standalone
+            # Figure so a SweetViz report drawing in the background cannot interfere
+            fig = Figure(figsize=(10, 8))
+            ax = fig.subplots()
+            im = ax.imshow(C, cmap='coolwarm', vmin=-1, vmax=1)
+            ax.set_xticks(range(k))
+            ax.set_xticklabels(numeric_cols, rotation=90)
+            ax.set_yticks(range(k))
+            ax.set_yticklabels(numeric_cols)
+            fig.colorbar(im, ax=ax)
+            
+            if k <= _HEATMAP_ANNOTATE_MAX:
+                for i, j in np.ndindex(k, k):
+                    ax.text(j, i, f'{C[i, j]:.2f}', ha='center', va='center', fontsize=8)
             
+            ax.set_title('Variable Correlations')
+            fig.tight_layout()
+            _show_figure(fig)
+        
+        # AI-powered insights
+        if insights is not None:
             try:
-                response = self._get_ai_response(eda_prompt, 'auto', 0.4)
+                response = insights.result()
                 display(Markdown(f"**🤖 AI Research Insights:**\n\n{response}"))
             except Exception as e:
                 display(HTML(f'<div style="color: orange;">AI insights unavailable: {str(e)}</div>'))
@@ -268,15 +750,18 @@ class AcademicResearchMagics(AIAssistantMagics):
         
         display(HTML("<h3>📊 Statistical Analysis</h3>"))
         
+        numeric_cols, categorical_cols = self._column_groups()
+        
         # AI recommendations for statistical tests
+        recommendations = None
         if self.clients:
             stats_prompt = f"""
             As a research statistician, recommend appropriate statistical analyses for this dataset:
             
             Dataset context:
             - Shape: {df.shape}
-            - Numeric variables: {list(df.select_dtypes(include=[np.number]).columns)}
-            - Categorical variables: {list(df.select_dtypes(include=['object']).columns)}
+            - Numeric variables: {list(numeric_cols)}
+            - Categorical variables: {list(categorical_cols)}
             {f'- Research question: {self.research_question}' if self.research_question else ''}
             {f'- Requested test type: {args.test_type}' if args.test_type else ''}
             {f'- Variables of interest: {args.variables}' if args.variables else ''}
@@ -288,34 +773,35 @@ class AcademicResearchMagics(AIAssistantMagics):
             4. How to interpret results in research context
             5. Effect size calculations where appropriate
             """
+            recommendations = self._submit_ai_request(stats_prompt, 0.2)
+        
+        # Basic statistical tests based on data, computed while the AI request is in flight
+        correlation_tests = None
+        if len(numeric_cols) >= 2:
+            # All pairs at once: one set of matrix products instead of a pearsonr call per pair
+            X = df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+            r, p, n = _correlation_tests(X)
+            i, j = np.triu_indices(len(numeric_cols), k=1)
             
+            correlation_tests = pd.DataFrame({
+                'Variable 1': np.asarray(numeric_cols)[i],
+                'Variable 2': np.asarray(numeric_cols)[j],
+                'Correlation': r[i, j].round(4),
+                'P-value': p[i, j].round(4),
+                'N': n[i, j],
+                'Significant': p[i, j] < 0.05
+            }).sort_values('P-value', ignore_index=True)
+        
+        if recommendations is not None:
             try:
-                response = self._get_ai_response(stats_prompt, 'auto', 0.2)
+                response = recommendations.result()
                 display(Markdown(f"**🤖 Statistical Analysis Recommendations:**\n\n{response}"))
             except Exception as e:
                 display(HTML(f'<div style="color: orange;">AI recommendations unavailable: {str(e)}</div>'))
         
-        # Basic statistical tests based on data
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        categorical_cols = df.select_dtypes(include=['object']).columns
-        
-        if len(numeric_cols) >= 2:
+        if correlation_tests is not None:
             display(HTML("<h4>🔍 Correlation Tests</h4>"))
-            from scipy.stats import pearsonr
-            
-            # Example correlation test
-            if len(numeric_cols) >= 2:
-                var1, var2 = numeric_cols[0], numeric_cols[1]
-                corr, p_value = pearsonr(df[var1].dropna(), df[var2].dropna())
-                
-                display(HTML(f"""
-                <div style="background: #f8f9fa; padding: 15px; border-radius: 5px; margin: 10px 0;">
-                    <p><strong>Correlation Test:</strong> {var1} vs {var2}</p>
-                    <p><strong>Correlation coefficient:</strong> {corr:.4f}</p>
-                    <p><strong>P-value:</strong> {p_value:.4f}</p>
-                    <p><strong>Interpretation:</strong> {'Significant' if p_value < 0.05 else 'Not significant'} correlation</p>
-                </div>
-                """))
+            display(correlation_tests)
     
     @line_magic
     def research_report(self, line):
@@ -353,12 +839,11 @@ class AcademicResearchMagics(AIAssistantMagics):
                 display(Markdown(f"**📝 Generated Research Report Section:**\n\n{response}"))
                 
                 # Save to file
-                with open('research_report_section.md', 'w') as f:
-                    f.write(response)
+                report_path = _write_report('research_report_section.md', response)
                 
-                display(HTML("""
+                display(HTML(f"""
                 <div style="background: #d4edda; padding: 15px; border-radius: 5px; margin: 10px 0;">
-                    <p>💾 <strong>Report saved:</strong> <code>research_report_section.md</code></p>
+                    <p>💾 <strong>Report saved:</strong> <code>{report_path}</code></p>
                 </div>
                 """))
                 
@@ -380,34 +865,8 @@ class AcademicResearchMagics(AIAssistantMagics):
             sources = [s.strip() for s in args.sources.split(',')]
             results = search_research_papers(args.query, sources, args.max_results)
             
-            display(HTML(f"<h3>📚 Research Papers for '{args.query}'</h3>"))
-            
-            for source, papers in results.items():
-                if papers:
-                    display(HTML(f"<h4>🔍 {source.upper()} Results:</h4>"))
-                    
-                    for i, paper in enumerate(papers, 1):
-                        authors_str = ', '.join(paper.get('authors', ['Unknown']))
-                        if len(authors_str) > 100:
-                            authors_str = authors_str[:100] + '...'
-                        
-                        summary = paper.get('summary', 'No summary available')
-                        if len(summary) > 200:
-                            summary = summary[:200] + '...'
-                        
-                        display(HTML(f"""
-                        <div style="background: #f8f9fa; padding: 15px; margin: 10px 0; border-radius: 5px; border-left: 4px solid #007bff;">
-                            <h5>{i}. {paper.get('title', 'Unknown Title')}</h5>
-                            <p><strong>Authors:</strong> {authors_str}</p>
-                            <p><strong>Published:</strong> {paper.get('published', 'Unknown')}</p>
-                            <p><strong>Summary:</strong> {summary}</p>
-                            <p><strong>URL:</strong> <a href="{paper.get('url', '#')}" target="_blank">View Paper</a></p>
-                        </div>
-                        """))
-                else:
-                    display(HTML(f"<p>No results found in {source.upper()}</p>"))
-            
-            # AI-powered literature analysis
+            # Start the literature analysis first so it runs while the papers render
+            analysis = None
             if self.clients and results:
                 all_papers = []
                 for papers in results.values():
@@ -430,12 +889,24 @@ class AcademicResearchMagics(AIAssistantMagics):
                     3. Most relevant papers for further reading
                     4. Suggested research directions
                     """
-                    
-                    try:
-                        response = self._get_ai_response(analysis_prompt, 'auto', 0.3)
-                        display(Markdown(f"**🤖 AI Literature Analysis:**\n\n{response}"))
-                    except Exception as e:
-                        display(HTML(f'<div style="color: orange;">AI analysis unavailable: {str(e)}</div>'))
+                    analysis = self._submit_ai_request(analysis_prompt, 0.3)
+            
+            sections = [f"<h3>📚 Research Papers for '{args.query}'</h3>"]
+            for source, papers in results.items():
+                if papers:
+                    sections.append(f"<h4>🔍 {source.upper()} Results:</h4>")
+                    sections.append(_render_papers(papers))
+                else:
+                    sections.append(f"<p>No results found in {source.upper()}</p>")
+            display(HTML(''.join(sections)))
+            
+            # AI-powered literature analysis
+            if analysis is not None:
+                try:
+                    response = analysis.result()
+                    display(Markdown(f"**🤖 AI Literature Analysis:**\n\n{response}"))
+                except Exception as e:
+                    display(HTML(f'<div style="color: orange;">AI analysis unavailable: {str(e)}</div>'))
         
         except ImportError:
             display(HTML('<div style="color: red;">Research data sources not available. Install required packages.</div>'))
@@ -458,17 +929,7 @@ class AcademicResearchMagics(AIAssistantMagics):
             display(HTML("<h3>📊 Available Research Datasets</h3>"))
             
             if datasets:
-                for i, dataset in enumerate(datasets, 1):
-                    display(HTML(f"""
-                    <div style="background: #e8f5e8; padding: 15px; margin: 10px 0; border-radius: 5px;">
-                        <h4>{i}. {dataset.get('name', dataset.get('title', 'Unknown Dataset'))}</h4>
-                        <p><strong>Description:</strong> {dataset.get('description', 'No description available')}</p>
-                        <p><strong>Size:</strong> {dataset.get('instances', dataset.get('size', 'Unknown'))} instances</p>
-                        <p><strong>Features:</strong> {dataset.get('attributes', 'Unknown')} attributes</p>
-                        <p><strong>Domain:</strong> {dataset.get('area', dataset.get('domain', 'General'))}</p>
-                        {f'<p><strong>URL:</strong> <a href="{dataset["url"]}" target="_blank">Access Dataset</a></p>' if dataset.get('url') else ''}
-                    </div>
-                    """))
+                display(HTML(_render_datasets(datasets)))
             else:
                 display(HTML('<p>No datasets found for the specified criteria.</p>'))
             
@@ -496,7 +957,7 @@ class AcademicResearchMagics(AIAssistantMagics):
         args = parse_argstring(self.research_worldbank, line)
         
         try:
-            from .data_sources import AcademicDataSources, get_world_bank_indicators
+            from .data_sources import get_data_sources, get_world_bank_indicators
             
             # Parse year range
             if '-' in args.years:
@@ -504,19 +965,15 @@ class AcademicResearchMagics(AIAssistantMagics):
             else:
                 start_year = end_year = int(args.years)
             
-            data_sources = AcademicDataSources()
+            data_sources = get_data_sources()
             
             # Show available indicators if requested
             if args.indicator.lower() in ['list', 'help', 'indicators']:
                 indicators = get_world_bank_indicators()
-                display(HTML("<h3>🌍 Available World Bank Indicators</h3>"))
-                
-                for indicator in indicators:
-                    display(HTML(f"""
-                    <div style="background: #f0f8ff; padding: 10px; margin: 5px 0; border-radius: 3px;">
-                        <strong>{indicator['code']}</strong>: {indicator['name']}
-                    </div>
-                    """))
+                display(HTML(
+                    "<h3>🌍 Available World Bank Indicators</h3>"
+                    + ''.join(_INDICATOR_TMPL.format_map(indicator) for indicator in indicators)
+                ))
                 
                 display(HTML("""
                 <div style="background: #fff3cd; padding: 15px; border-radius: 5px; margin: 10px 0;">
@@ -537,14 +994,17 @@ class AcademicResearchMagics(AIAssistantMagics):
                 
                 # Simple visualization
                 if len(df) > 1:
-                    plt.figure(figsize=(10, 6))
-                    plt.plot(df.index, df.iloc[:, 0])
-                    plt.title(f'{args.indicator} - {args.country}')
-                    plt.xlabel('Year')
-                    plt.ylabel('Value')
-                    plt.grid(True, alpha=0.3)
-                    plt.tight_layout()
-                    plt.show()
+                    from matplotlib.figure import Figure
+                    
+                    fig = Figure(figsize=(10, 6))
+                    ax = fig.subplots()
+                    ax.plot(df.index, df.iloc[:, 0])
+                    ax.set_title(f'{args.indicator} - {args.country}')
+                    ax.set_xlabel('Year')
+                    ax.set_ylabel('Value')
+                    ax.grid(True, alpha=0.3)
+                    fig.tight_layout()
+                    _show_figure(fig)
                 
                 # Store for further analysis
                 self.current_dataset = df
@@ -582,6 +1042,9 @@ class AcademicResearchMagics(AIAssistantMagics):
             <li><code>%research_load data.csv --research_question "Your question"</code> - Load and analyze dataset</li>
             <li><code>%research_eda</code> - Comprehensive exploratory data analysis</li>
             <li><code>%research_clean --interactive</code> - AI-guided data cleaning</li>
+            <li><code>%research_clean_missing --strategy median</code> - Drop or fill missing values</li>
+            <li><code>%research_clean_duplicates</code> - Remove duplicate rows</li>
+            <li><code>%research_clean_outliers --method iqr --remove</code> - Detect or remove outliers</li>
         </ul>
         
         <h4>📈 Statistical Analysis:</h4>
@@ -643,25 +1106,28 @@ class AcademicResearchMagics(AIAssistantMagics):
         display(HTML(help_html))
 
 
+_magics = None
+
+
 def load_ipython_extension(ipython):
     """Load the academic research extension in IPython/Jupyter."""
-    magics = AcademicResearchMagics(ipython)
-    
-    # Data loading and analysis commands
-    ipython.register_magic_function(magics.research_load, 'line', 'research_load')
-    ipython.register_magic_function(magics.research_clean, 'line', 'research_clean')
-    ipython.register_magic_function(magics.research_eda, 'line', 'research_eda')
-    ipython.register_magic_function(magics.research_stats, 'line', 'research_stats')
-    ipython.register_magic_function(magics.research_report, 'line', 'research_report')
-    
-    # Literature and data discovery commands
-    ipython.register_magic_function(magics.research_papers, 'line', 'research_papers')
-    ipython.register_magic_function(magics.research_datasets, 'line', 'research_datasets')
-    ipython.register_magic_function(magics.research_worldbank, 'line', 'research_worldbank')
+    global _magics
+    # Cleaning magics take shallow copies; copy-on-write keeps them from aliasing the original
+    pd.options.mode.copy_on_write = True
     
-    # Help command
-    ipython.register_magic_function(magics.research_help, 'line', 'research_help')
+    # One instance registers every research_* magic declared on the class
+    magics = AcademicResearchMagics(ipython)
+    ipython.register_magics(magics)
+    _magics = magics
     
     print("🎓 Academic Research Assistant loaded!")
     print("📚 Now with access to research papers and open datasets!")
-    print("Use %research_help to see all available commands.")
\ No newline at end of file
+    print("Use %research_help to see all available commands.")
+
+
+def unload_ipython_extension(ipython):
+    """Unload the academic research extension."""
+    global _magics
+    if _magics is not None:
+        _magics.close()
+        _magics = None
@@ -0,0 +1,3 @@
+"""
+Static files shipped with the AI Assistant package.
+"""
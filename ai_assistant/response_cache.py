@@ -0,0 +1,165 @@
+"""
+Response cache for AI assistant calls.
+
+Repeated or near-identical prompts are answered from a local cache instead of
+making another API round-trip. Lookups go through two tiers:
+
+- an exact tier keyed by (model, prompt hash, temperature bucket), and
+- an optional semantic tier that compares prompt embeddings by cosine similarity.
+
+Entries are appended to a JSONL file so the cache survives kernel restarts. Once
+the file holds more than twice ``max_entries`` lines it is rewritten from memory.
+"""
+
+import os
+import json
+import hashlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple, List
+import numpy as np
+
+
+DEFAULT_CACHE_PATH = Path.home() / '.ai_notebooks_cache.jsonl'
+
+
+class ResponseCache:
+    """Two-tier (exact + semantic) LRU cache for model responses."""
+
+    def __init__(self, path: Optional[Path] = DEFAULT_CACHE_PATH, max_entries: int = 512,
+                 similarity_threshold: float = 0.95, max_temperature: float = 0.3):
+        self.path = Path(path) if path else None
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.max_temperature = max_temperature
+        # key -> (response, embedding); embeddings are kept so the file can be rewritten
+        self._exact: OrderedDict = OrderedDict()
+        self._semantic: List[Tuple[str, np.ndarray, str]] = []
+        self._file_lines = 0
+        self._load()
+
+    @staticmethod
+    def _key(model: str, prompt: str, temperature: float) -> Tuple[str, str, float]:
+        """Build the exact-match key for a prompt."""
+        prompt_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        return (model, prompt_hash, round(temperature, 1))
+
+    def is_cacheable(self, temperature: float) -> bool:
+        """Only low-temperature responses are reused; creative outputs are not."""
+        return temperature <= self.max_temperature
+
+    def get(self, model: str, prompt: str, temperature: float) -> Optional[str]:
+        """Return an exact-match cached response, if any."""
+        key = self._key(model, prompt, temperature)
+        entry = self._exact.get(key)
+        if entry is None:
+            return None
+        self._exact.move_to_end(key)
+        return entry[0]
+
+    def get_similar(self, model: str, embedding: np.ndarray) -> Optional[str]:
+        """Return the cached response whose prompt embedding is most similar, if close enough."""
+        candidates = [(emb, response) for entry_model, emb, response in self._semantic
+                      if entry_model == model]
+        if not candidates:
+            return None
+
+        embeddings = np.stack([emb for emb, _ in candidates])
+        norms = np.linalg.norm(embeddings, axis=1) * np.linalg.norm(embedding)
+        similarities = embeddings @ embedding / np.where(norms == 0, 1, norms)
+
+        best = int(np.argmax(similarities))
+        if similarities[best] >= self.similarity_threshold:
+            return candidates[best][1]
+        return None
+
+    def put(self, model: str, prompt: str, temperature: float, response: str,
+            embedding: Optional[np.ndarray] = None):
+        """Store a response and append it to the on-disk cache."""
+        key = self._key(model, prompt, temperature)
+        self._store(key, response, embedding)
+
+        if not self.path:
+            return
+
+        if self._file_lines >= 2 * self.max_entries:
+            self._compact()
+            return
+
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(self._record_line(key, response, embedding))
+            self._file_lines += 1
+        except OSError:
+            pass
+
+    def clear(self):
+        """Drop all cached responses, including the on-disk copy."""
+        self._exact.clear()
+        self._semantic.clear()
+        self._file_lines = 0
+        if self.path and self.path.exists():
+            self.path.unlink()
+
+    @staticmethod
+    def _record_line(key: Tuple[str, str, float], response: str,
+                     embedding: Optional[np.ndarray]) -> str:
+        """Serialize one entry as a JSONL line."""
+        record = {
+            'model': key[0],
+            'prompt_hash': key[1],
+            'temperature': key[2],
+            'response': response,
+            'embedding': embedding.tolist() if embedding is not None else None
+        }
+        return json.dumps(record) + '\n'
+
+    def _compact(self):
+        """Atomically rewrite the cache file with only the entries held in memory."""
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for key, (response, embedding) in self._exact.items():
+                    f.write(self._record_line(key, response, embedding))
+            os.replace(tmp_path, self.path)
+            self._file_lines = len(self._exact)
+        except OSError:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
+    def _store(self, key: Tuple[str, str, float], response: str, embedding: Optional[np.ndarray]):
+        """Insert into the in-memory tiers, evicting the oldest entries past the bound."""
+        self._exact[key] = (response, embedding)
+        self._exact.move_to_end(key)
+        while len(self._exact) > self.max_entries:
+            self._exact.popitem(last=False)
+
+        if embedding is not None:
+            self._semantic.append((key[0], embedding, response))
+            if len(self._semantic) > self.max_entries:
+                self._semantic = self._semantic[-self.max_entries:]
+
+    def _load(self):
+        """Load previously persisted entries, compacting the file if it has grown too long."""
+        if not self.path or not self.path.exists():
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    self._file_lines += 1
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    key = (record['model'], record['prompt_hash'], record['temperature'])
+                    embedding = record.get('embedding')
+                    self._store(key, record['response'],
+                                np.asarray(embedding, dtype=np.float32) if embedding else None)
+        except OSError:
+            return
+
+        if self._file_lines > 2 * self.max_entries:
+            self._compact()
@@ -0,0 +1,46 @@
+"""
+Retry helper for transient AI provider failures.
+
+Rate-limit (429) and server (5xx) responses, timeouts and dropped connections
+are retried with exponential backoff and full jitter.
+"""
+
+import sys
+import random
+import asyncio
+from typing import Awaitable, Callable, TypeVar
+
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+T = TypeVar('T')
+
+
+def is_retryable(exc: Exception) -> bool:
+    """Check whether a provider error is worth retrying."""
+    # Timeouts are subclasses of the connection errors in both SDKs. Only an
+    # SDK that has already been imported can have raised, so don't import here.
+    for sdk in ('openai', 'anthropic'):
+        module = sys.modules.get(sdk)
+        if module is not None and isinstance(exc, module.APIConnectionError):
+            return True
+
+    # OpenAI/Anthropic errors carry `status_code`; google.api_core errors carry `code`
+    status = getattr(exc, 'status_code', None) or getattr(exc, 'code', None)
+    return status in RETRYABLE_STATUS_CODES
+
+
+async def with_retry(coro_factory: Callable[[], Awaitable[T]], max_retries: int = 4,
+                     base: float = 0.5) -> T:
+    """
+    Await a fresh coroutine from `coro_factory`, retrying transient failures.
+
+    A factory is required because a coroutine can only be awaited once.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return await coro_factory()
+        except Exception as e:
+            if attempt == max_retries or not is_retryable(e):
+                raise
+            await asyncio.sleep(random.uniform(0, base * 2 ** attempt))
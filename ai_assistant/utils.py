@@ -9,6 +9,21 @@ from IPython.display import display, HTML, Javascript
 from IPython import get_ipython
 
 
+RESOURCES_DIR = Path(__file__).parent / 'resources'
+
+NO_API_KEYS_HTML = """
+        <div style="color: orange; margin-top: 10px;">
+            <strong>No API keys found!</strong><br>
+            Please add your API keys to the .env file:
+            <pre>
+OPENAI_API_KEY=your_openai_key_here
+ANTHROPIC_API_KEY=your_anthropic_key_here
+GOOGLE_API_KEY=your_google_key_here
+            </pre>
+        </div>
+        """
+
+
 def setup_assistant():
     """Set up the AI assistant in the current notebook environment."""
     # Add the ai_assistant package to Python path
@@ -55,208 +70,24 @@ def check_api_keys():
         'Google': os.getenv('GOOGLE_API_KEY') is not None
     }
     
-    html_content = "<h3>API Keys Status</h3><ul>"
-    for service, available in keys_status.items():
-        status = "✅ Configured" if available else "❌ Not configured"
-        html_content += f"<li><strong>{service}</strong>: {status}</li>"
-    html_content += "</ul>"
+    parts = ["<h3>API Keys Status</h3><ul>"]
+    parts.extend(
+        f"<li><strong>{service}</strong>: {'✅ Configured' if available else '❌ Not configured'}</li>"
+        for service, available in keys_status.items()
+    )
+    parts.append("</ul>")
     
     if not any(keys_status.values()):
-        html_content += """
-        <div style="color: orange; margin-top: 10px;">
-            <strong>No API keys found!</strong><br>
-            Please add your API keys to the .env file:
-            <pre>
-OPENAI_API_KEY=your_openai_key_here
-ANTHROPIC_API_KEY=your_anthropic_key_here
-GOOGLE_API_KEY=your_google_key_here
-            </pre>
-        </div>
-        """
+        parts.append(NO_API_KEYS_HTML)
     
-    display(HTML(html_content))
+    display(HTML("".join(parts)))
     return keys_status
 
 
 def create_demo_notebook():
     """Create a demo notebook showcasing AI Assistant features."""
-    demo_content = '''
-{
- "cells": [
-  {
-   "cell_type": "markdown",
-   "metadata": {},
-   "source": [
-    "# 🤖 AI Assistant Demo\\n",
-    "\\n",
-    "This notebook demonstrates the AI Assistant features for AI-Notebooks.\\n",
-    "\\n",
-    "## Setup\\n",
-    "\\n",
-    "First, let's set up the AI Assistant:"
-   ]
-  },
-  {
-   "cell_type": "code",
-   "execution_count": null,
-   "metadata": {},
-   "outputs": [],
-   "source": [
-    "# Setup AI Assistant\\n",
-    "from ai_assistant.utils import setup_assistant\\n",
-    "setup_assistant()"
-   ]
-  },
-  {
-   "cell_type": "markdown",
-   "metadata": {},
-   "source": [
-    "## Check Available Models\\n",
-    "\\n",
-    "Let's see which AI models are available:"
-   ]
-  },
-  {
-   "cell_type": "code",
-   "execution_count": null,
-   "metadata": {},
-   "outputs": [],
-   "source": [
-    "%ai_models"
-   ]
-  },
-  {
-   "cell_type": "markdown",
-   "metadata": {},
-   "source": [
-    "## Chat with AI\\n",
-    "\\n",
-    "Ask the AI assistant questions about your code or concepts:"
-   ]
-  },
-  {
-   "cell_type": "code",
-   "execution_count": null,
-   "metadata": {},
-   "outputs": [],
-   "source": [
-    "%ai_chat What is the difference between supervised and unsupervised learning?"
-   ]
-  },
-  {
-   "cell_type": "markdown",
-   "metadata": {},
-   "source": [
-    "## Code Generation\\n",
-    "\\n",
-    "Generate code from natural language descriptions:"
-   ]
-  },
-  {
-   "cell_type": "code",
-   "execution_count": null,
-   "metadata": {},
-   "outputs": [],
-   "source": [
-    "%ai_generate Create a function to calculate the mean and standard deviation of a list of numbers"
-   ]
-  },
-  {
-   "cell_type": "markdown",
-   "metadata": {},
-   "source": [
-    "## Code Analysis\\n",
-    "\\n",
-    "Analyze and explain existing code:"
-   ]
-  },
-  {
-   "cell_type": "code",
-   "execution_count": null,
-   "metadata": {},
-   "outputs": [],
-   "source": [
-    "%%ai_code --action explain\\n",
-    "import pandas as pd\\n",
-    "import numpy as np\\n",
-    "\\n",
-    "def process_data(df):\\n",
-    "    # Remove duplicates\\n",
-    "    df_clean = df.drop_duplicates()\\n",
-    "    \\n",
-    "    # Fill missing values\\n",
-    "    numeric_columns = df_clean.select_dtypes(include=[np.number]).columns\\n",
-    "    df_clean[numeric_columns] = df_clean[numeric_columns].fillna(df_clean[numeric_columns].mean())\\n",
-    "    \\n",
-    "    return df_clean"
-   ]
-  },
-  {
-   "cell_type": "markdown",
-   "metadata": {},
-   "source": [
-    "## Model Playground\\n",
-    "\\n",
-    "Use the interactive model playground to compare different AI models:"
-   ]
-  },
-  {
-   "cell_type": "code",
-   "execution_count": null,
-   "metadata": {},
-   "outputs": [],
-   "source": [
-    "from ai_assistant.model_playground import create_playground\\n",
-    "\\n",
-    "playground = create_playground()\\n",
-    "playground.display()"
-   ]
-  },
-  {
-   "cell_type": "markdown",
-   "metadata": {},
-   "source": [
-    "## Help\\n",
-    "\\n",
-    "Get help on all available commands:"
-   ]
-  },
-  {
-   "cell_type": "code",
-   "execution_count": null,
-   "metadata": {},
-   "outputs": [],
-   "source": [
-    "%ai_help"
-   ]
-  }
- ],
- "metadata": {
-  "kernelspec": {
-   "display_name": "Python 3",
-   "language": "python",
-   "name": "python3"
-  },
-  "language_info": {
-   "codemirror_mode": {
-    "name": "ipython",
-    "version": 3
-   },
-   "file_extension": ".py",
-   "mimetype": "text/x-python",
-   "name": "python",
-   "nbconvert_exporter": "python",
-   "pygments_lexer": "ipython3",
-   "version": "3.8.0"
-  }
- },
- "nbformat": 4,
- "nbformat_minor": 4
-}
-'''
-    
-    with open('notebooks/ai_assistant_demo.ipynb', 'w') as f:
-        f.write(demo_content)
+    demo_content = (RESOURCES_DIR / 'demo_notebook.ipynb').read_bytes()
+    Path('notebooks/ai_assistant_demo.ipynb').write_bytes(demo_content)
     
     print("✅ Demo notebook created: notebooks/ai_assistant_demo.ipynb")
 
@@ -275,12 +106,18 @@ def install_dependencies():
     
     print("Installing AI Assistant dependencies...")
     
-    for dep in dependencies:
-        try:
-            subprocess.check_call([sys.executable, '-m', 'pip', 'install', dep])
-            print(f"✅ Installed {dep}")
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Failed to install {dep}: {e}")
+    # One pip run resolves everything together; if it fails, retry per package
+    # so one unavailable package does not block the rest
+    try:
+        subprocess.check_call([sys.executable, '-m', 'pip', 'install', *dependencies])
+        print(f"✅ Installed {len(dependencies)} packages")
+    except subprocess.CalledProcessError:
+        for dep in dependencies:
+            try:
+                subprocess.check_call([sys.executable, '-m', 'pip', 'install', dep])
+                print(f"✅ Installed {dep}")
+            except subprocess.CalledProcessError as e:
+                print(f"❌ Failed to install {dep}: {e}")
     
     print("\\n🎉 Installation complete! Run setup_assistant() to get started.")
 
@@ -301,15 +138,24 @@ def get_notebook_context():
 
 def create_startup_script():
     """Create a startup script to automatically load AI Assistant."""
-    startup_content = '''
+    # The project root is resolved once here and baked into the script, so kernel
+    # start-up never has to search for the package
+    project_root = Path(__file__).resolve().parent.parent
+    startup_content = f'''
 # AI Assistant Auto-loader
+import sys
+import importlib.util
+
+if importlib.util.find_spec('ai_assistant') is None:
+    sys.path.insert(0, {str(project_root)!r})
+
 try:
     from ai_assistant.utils import setup_assistant
     setup_assistant()
 except ImportError:
     print("AI Assistant not available. Run: pip install -r requirements.txt")
 except Exception as e:
-    print(f"AI Assistant setup failed: {e}")
+    print(f"AI Assistant setup failed: {{e}}")
 '''
     
     # Create IPython startup directory if it doesn't exist
@@ -0,0 +1,29 @@
+"""
+Shared pytest fixtures for the Phase 1 integration tests.
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+
+@pytest.fixture(scope='session')
+def ai_modules():
+    """Import the Phase 1 modules once and share them across tests."""
+    import ai_assistant
+    from ai_assistant import magic_commands, model_playground, utils
+    from web_interface import app as web_app
+
+    return SimpleNamespace(
+        ai_assistant=ai_assistant,
+        magic_commands=magic_commands,
+        model_playground=model_playground,
+        utils=utils,
+        web_app=web_app,
+    )
@@ -6,9 +6,57 @@ This script helps maintain clean notebooks in version control.
 
 import json
 import os
+import re
+import mmap
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Non-empty outputs or a non-null execution count; quotes inside JSON strings are
+# escaped, so cell source text can't match
+_NEEDS_CLEANING = re.compile(rb'"outputs":\s*\[\s*\{|"execution_count":\s*\d')
+
+
+def _needs_cleaning(notebook_path):
+    """Scan the raw bytes for anything clean_notebook would remove, without parsing."""
+    with open(notebook_path, 'rb') as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return _NEEDS_CLEANING.search(mm) is not None
+        except ValueError:
+            # Empty files can't be mapped; let the parser report them
+            return True
+
+
+# Shared by every fallback parse; notebooks are UTF-8, so encoding detection is skipped
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _loads(data):
+    """Parse notebook JSON from bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return _JSON_DECODER.decode(data.decode('utf-8-sig'))
+
+
+def _dumps(nb):
+    """Serialize a notebook as 2-space indented UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(nb, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(nb, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def write_notebook(notebook_path, nb):
+    """Write a cleaned notebook back to disk."""
+    with open(notebook_path, 'wb') as f:
+        f.write(_dumps(nb))
+
 
 def clean_notebook(notebook_path):
     """
@@ -18,10 +66,14 @@ def clean_notebook(notebook_path):
         notebook_path (str): Path to the notebook file
         
     Returns:
-        tuple: (notebook_data, changes_made)
+        tuple: (notebook_data, changes_made); notebook_data is None when
+        the notebook is already clean
     """
-    with open(notebook_path, 'r', encoding='utf-8') as f:
-        nb = json.load(f)
+    if not _needs_cleaning(notebook_path):
+        return None, False
+    
+    with open(notebook_path, 'rb') as f:
+        nb = _loads(f.read())
     
     changes_made = False
     
@@ -44,35 +96,61 @@ def clean_notebook(notebook_path):
     return nb, changes_made
 
 
-def clean_notebooks_in_directory(directory, dry_run=False):
+# Directories that never hold notebooks worth cleaning
+_SKIP_DIRS = frozenset({'.git', '.ipynb_checkpoints', 'node_modules'})
+
+
+def _iter_ipynb(directory):
+    """Yield notebook paths under a directory, using the stat info cached by scandir."""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in _SKIP_DIRS:
+                    yield from _iter_ipynb(entry.path)
+            elif entry.name.endswith('.ipynb'):
+                yield entry.path
+
+
+def _clean_to_bytes(notebook_path):
+    """Worker: clean one notebook; return its serialized form, or None if unchanged."""
+    nb, changes_made = clean_notebook(notebook_path)
+    return _dumps(nb) if changes_made else None
+
+
+def clean_notebooks_in_directory(directory, dry_run=False, max_workers=None):
     """
     Clean all notebooks in a directory recursively.
     
     Args:
         directory (str): Directory to search for notebooks
         dry_run (bool): If True, don't actually modify files
+        max_workers (int): Worker processes to use (default: one per CPU)
         
     Returns:
         int: Number of notebooks cleaned
     """
-    cleaned_count = 0
+    notebook_paths = list(_iter_ipynb(directory))
+    
+    # JSON parsing is CPU-bound, so notebooks are cleaned in separate processes;
+    # files are only written here, which keeps --dry-run and the output order intact
+    if len(notebook_paths) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            cleaned = list(executor.map(_clean_to_bytes, notebook_paths, chunksize=8))
+    else:
+        cleaned = [_clean_to_bytes(path) for path in notebook_paths]
     
-    for root, dirs, files in os.walk(directory):
-        for file in files:
-            if file.endswith('.ipynb'):
-                notebook_path = os.path.join(root, file)
-                nb, changes_made = clean_notebook(notebook_path)
-                
-                if changes_made:
-                    if dry_run:
-                        print(f"Would clean: {notebook_path}")
-                    else:
-                        with open(notebook_path, 'w', encoding='utf-8') as f:
-                            json.dump(nb, f, indent=2, ensure_ascii=False)
-                        print(f"Cleaned: {notebook_path}")
-                    cleaned_count += 1
-                else:
-                    print(f"Already clean: {notebook_path}")
+    cleaned_count = 0
+    for notebook_path, data in zip(notebook_paths, cleaned):
+        if data is not None:
+            if dry_run:
+                print(f"Would clean: {notebook_path}")
+            else:
+                with open(notebook_path, 'wb') as f:
+                    f.write(data)
+                print(f"Cleaned: {notebook_path}")
+            cleaned_count += 1
+        else:
+            print(f"Already clean: {notebook_path}")
     
     return cleaned_count
 
@@ -102,8 +180,7 @@ def main():
             if args.dry_run:
                 print(f"Would clean: {path}")
             else:
-                with open(path, 'w', encoding='utf-8') as f:
-                    json.dump(nb, f, indent=2, ensure_ascii=False)
+                write_notebook(path, nb)
                 print(f"Cleaned: {path}")
         else:
             print(f"Already clean: {path}")
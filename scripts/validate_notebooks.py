@@ -5,150 +5,291 @@ Validate notebooks for common issues and best practices.
 
 import json
 import os
+import codecs
 import re
+import mmap
 import argparse
+import multiprocessing
 from pathlib import Path
 
+try:
+    import re2
+except ImportError:
+    re2 = None
 
-class NotebookValidator:
-    def __init__(self):
-        self.issues = []
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# (name, issue, pattern) for each code cell content check
+_CELL_RULES = (
+    ('api_key', 'Possible hardcoded API key or secret', r'["\'][a-zA-Z0-9]{20,}["\']'),
+    ('aws_key', 'Possible hardcoded AWS access key', r'AKIA[0-9A-Z]{16}'),
+    ('private_key', 'Embedded private key', r'-----BEGIN [A-Z ]*PRIVATE KEY-----'),
+)
+
+# (name, issue, needle) for plain substring checks
+_CELL_LITERALS = (
+    ('os_system', 'os.system call - consider subprocess.run', 'os.system('),
+)
+
+# Regex rules and escaped literals fused into one alternation so each cell is
+# scanned once; RE2 runs it as a linear-time DFA when installed
+_CELL_RULES_RE = (re2 or re).compile('|'.join(
+    [f'(?P<{name}>{pattern})' for name, _, pattern in _CELL_RULES] +
+    [f'(?P<{name}>{re.escape(needle)})' for name, _, needle in _CELL_LITERALS]
+))
+_CELL_RULE_ISSUES = {name: issue for name, issue, _ in _CELL_RULES + _CELL_LITERALS}
+
+# Lines are matched in place rather than split and stripped one by one; [^\S\n]
+# is the whitespace str.strip() would remove, short of the line break itself
+_CODE_LINE_RE = re.compile(r'^[^\S\n]*(?!import|from|#)\S', re.MULTILINE)
+_IMPORT_LINE_RE = re.compile(r'^[^\S\n]*(?:import|from)', re.MULTILINE)
+
+# orjson.JSONDecodeError is a json.JSONDecodeError subclass, so it is covered too
+_JSON_ERRORS = (
+    (json.JSONDecodeError, ijson.JSONError) if ijson else (json.JSONDecodeError,)
+)
+
+# A non-empty outputs list or a non-null execution count; quotes inside JSON strings
+# are escaped, so cell sources cannot produce a false match
+_HAS_OUTPUTS_RE = re.compile(rb'"outputs"\s*:\s*\[\s*\{|"execution_count"\s*:\s*\d')
+
+
+def _has_outputs(f):
+    """Byte-level prescan for outputs, without parsing the notebook."""
+    try:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return _HAS_OUTPUTS_RE.search(data) is not None
+    except ValueError:
+        # Empty files cannot be mapped
+        return False
+
+
+def _source_is_blank(source):
+    """True if a list of source lines holds nothing but whitespace."""
+    return all(not line.strip() for line in source)
+
+
+def _source_line_count(source):
+    """Number of lines the joined source splits into on '\\n'."""
+    return sum(line.count('\n') for line in source) + 1
+
+
+def _iter_cells(f, structure):
+    """
+    Yield the cells of a notebook opened in binary mode.
     
-    def validate_notebook(self, notebook_path):
-        """Validate a single notebook file."""
-        self.issues = []
-        
-        try:
-            with open(notebook_path, 'r', encoding='utf-8') as f:
-                nb = json.load(f)
-        except json.JSONDecodeError as e:
-            self.issues.append(f"Invalid JSON: {e}")
-            return self.issues
-        except Exception as e:
-            self.issues.append(f"Error reading file: {e}")
-            return self.issues
-        
-        self._check_structure(nb)
-        self._check_cells(nb)
-        self._check_outputs(nb)
-        self._check_best_practices(nb)
-        
-        return self.issues
+    Each cell is reduced to its cell_type, source, execution_count and whether it
+    has any outputs. Notebooks with outputs are streamed with ijson so their
+    payloads are never built; output-free ones have nothing to skip and are parsed
+    in one call, by orjson when it is installed. Whether a 'cells' key and list
+    were seen is recorded in `structure`.
+    """
+    # json.loads on bytes would skip a UTF-8 BOM that orjson and ijson reject;
+    # reject it here so every parser reports the same error
+    if f.read(len(codecs.BOM_UTF8)) == codecs.BOM_UTF8:
+        raise json.JSONDecodeError(
+            "Unexpected UTF-8 BOM (decode using utf-8-sig)", '', 0
+        )
+    f.seek(0)
     
-    def _check_structure(self, nb):
-        """Check basic notebook structure."""
-        if 'cells' not in nb:
-            self.issues.append("Missing 'cells' key")
+    if ijson is None or not _has_outputs(f):
+        data = f.read()
+        nb = orjson.loads(data) if orjson is not None else json.loads(data)
+        structure['has_cells'] = isinstance(nb, dict) and 'cells' in nb
+        structure['cells_is_list'] = (
+            structure['has_cells'] and isinstance(nb['cells'], list)
+        )
+        if not structure['cells_is_list']:
             return
+        for cell in nb['cells']:
+            reduced = {
+                key: cell[key]
+                for key in ('cell_type', 'execution_count') if key in cell
+            }
+            source = cell.get('source', [])
+            reduced['source'] = [source] if isinstance(source, str) else source
+            reduced['outputs'] = bool(cell.get('outputs'))
+            yield reduced
+        return
+    
+    cell = None
+    for prefix, event, value in ijson.parse(f):
+        if prefix == '' and event == 'map_key' and value == 'cells':
+            structure['has_cells'] = True
+        elif prefix == 'cells' and event == 'start_array':
+            structure['cells_is_list'] = True
+        elif not prefix.startswith('cells.item'):
+            continue
+        elif prefix == 'cells.item':
+            if event == 'start_map':
+                cell = {'source': [], 'outputs': False}
+            elif event == 'end_map':
+                yield cell
+        elif prefix == 'cells.item.cell_type':
+            cell['cell_type'] = value
+        elif (prefix in ('cells.item.source', 'cells.item.source.item')
+              and event == 'string'):
+            cell['source'].append(value)
+        elif prefix == 'cells.item.execution_count':
+            cell['execution_count'] = value
+        elif prefix == 'cells.item.outputs.item':
+            cell['outputs'] = True
+
+
+def validate_notebook(notebook_path):
+    """Validate a single notebook file, returning its list of issues."""
+    issues = []
+    
+    try:
+        with open(notebook_path, 'rb') as f:
+            _check_notebook(f, issues)
+    except _JSON_ERRORS as e:
+        issues = [f"Invalid JSON: {e}"]
+    except Exception as e:
+        issues = [f"Error reading file: {e}"]
+    
+    return issues
+
+
+def _check_notebook(f, issues):
+    """Check structure, cells, outputs and best practices in one pass over the cells."""
+    structure = {'has_cells': False, 'cells_is_list': False}
+    markdown_cells = 0
+    code_cells = 0
+    cell_count = 0
+    first_cell_type = None
+    has_outputs = False
+    long_cells = []
+    
+    for i, cell in enumerate(_iter_cells(f, structure)):
+        cell_count += 1
+        if i == 0:
+            first_cell_type = cell.get('cell_type')
         
-        if not isinstance(nb['cells'], list):
-            self.issues.append("'cells' should be a list")
+        if 'cell_type' not in cell:
+            issues.append(f"Cell {i}: Missing cell_type")
+            continue
         
-        if len(nb['cells']) == 0:
-            self.issues.append("Notebook has no cells")
-    
-    def _check_cells(self, nb):
-        """Check individual cells."""
-        markdown_cells = 0
-        code_cells = 0
+        cell_type = cell['cell_type']
         
-        for i, cell in enumerate(nb.get('cells', [])):
-            if 'cell_type' not in cell:
-                self.issues.append(f"Cell {i}: Missing cell_type")
-                continue
+        if cell_type == 'markdown':
+            markdown_cells += 1
+            _check_markdown_cell(cell, i, issues)
+        elif cell_type == 'code':
+            code_cells += 1
+            _check_code_cell(cell, i, issues)
             
-            cell_type = cell['cell_type']
+            # Outputs that should be cleared; one positive is enough for the issue
+            if not has_outputs and (
+                cell['outputs'] or cell.get('execution_count') is not None
+            ):
+                has_outputs = True
             
-            if cell_type == 'markdown':
-                markdown_cells += 1
-                self._check_markdown_cell(cell, i)
-            elif cell_type == 'code':
-                code_cells += 1
-                self._check_code_cell(cell, i)
-        
-        # Check for reasonable balance
-        if code_cells > 0 and markdown_cells == 0:
-            self.issues.append("No markdown cells found - consider adding documentation")
+            if _source_line_count(cell['source']) > 50:
+                long_cells.append(
+                    f"Cell {i}: Very long code cell - consider breaking it up"
+                )
     
-    def _check_markdown_cell(self, cell, index):
-        """Check markdown cell content."""
-        source = ''.join(cell.get('source', []))
-        
-        if not source.strip():
-            self.issues.append(f"Cell {index}: Empty markdown cell")
+    # Structure problems are only known once the stream ends, but are reported first
+    if not structure['has_cells']:
+        issues[:] = ["Missing 'cells' key"]
+        return
+    if not structure['cells_is_list']:
+        issues.insert(0, "'cells' should be a list")
+    elif cell_count == 0:
+        issues.insert(0, "Notebook has no cells")
     
-    def _check_code_cell(self, cell, index):
-        """Check code cell content."""
-        source = ''.join(cell.get('source', []))
-        
-        if not source.strip():
-            self.issues.append(f"Cell {index}: Empty code cell")
-            return
-        
-        # Check for common issues
-        if 'import' in source and 'from' in source:
-            # Check for imports not at the top
-            lines = source.split('\n')
-            non_import_found = False
-            for line in lines:
-                line = line.strip()
-                if line and not line.startswith('#') and not line.startswith('import') and not line.startswith('from'):
-                    non_import_found = True
-                elif non_import_found and (line.startswith('import') or line.startswith('from')):
-                    self.issues.append(f"Cell {index}: Import statement after other code")
-                    break
-        
-        # Check for hardcoded API keys (basic check)
-        if re.search(r'["\'][a-zA-Z0-9]{20,}["\']', source):
-            self.issues.append(f"Cell {index}: Possible hardcoded API key or secret")
+    # Check for reasonable balance
+    if code_cells > 0 and markdown_cells == 0:
+        issues.append("No markdown cells found - consider adding documentation")
     
-    def _check_outputs(self, nb):
-        """Check for outputs that should be cleared."""
-        has_outputs = False
-        
-        for cell in nb.get('cells', []):
-            if cell.get('cell_type') == 'code':
-                if cell.get('outputs'):
-                    has_outputs = True
-                if cell.get('execution_count') is not None:
-                    has_outputs = True
-        
-        if has_outputs:
-            self.issues.append("Notebook contains outputs - consider cleaning before commit")
+    if has_outputs:
+        issues.append("Notebook contains outputs - consider cleaning before commit")
     
-    def _check_best_practices(self, nb):
-        """Check for best practices."""
-        cells = nb.get('cells', [])
-        
-        if not cells:
-            return
-        
-        # Check if first cell is markdown (good practice)
-        if cells[0].get('cell_type') != 'markdown':
-            self.issues.append("Consider starting with a markdown cell explaining the notebook")
-        
-        # Check for very long cells
-        for i, cell in enumerate(cells):
-            if cell.get('cell_type') == 'code':
-                source = ''.join(cell.get('source', []))
-                if len(source.split('\n')) > 50:
-                    self.issues.append(f"Cell {i}: Very long code cell - consider breaking it up")
+    # Check if first cell is markdown (good practice)
+    if cell_count and first_cell_type != 'markdown':
+        issues.append("Consider starting with a markdown cell explaining the notebook")
+    
+    issues.extend(long_cells)
+
+
+def _check_markdown_cell(cell, index, issues):
+    """Check markdown cell content."""
+    if _source_is_blank(cell['source']):
+        issues.append(f"Cell {index}: Empty markdown cell")
+
+
+def _check_code_cell(cell, index, issues):
+    """Check code cell content."""
+    if _source_is_blank(cell['source']):
+        issues.append(f"Cell {index}: Empty code cell")
+        return
+    
+    # Joined once and shared by the checks that scan across lines
+    source = ''.join(cell['source'])
+    
+    # Check for common issues
+    if 'import' in source and 'from' in source:
+        # Check for imports not at the top: an import line after the first code line
+        code_line = _CODE_LINE_RE.search(source)
+        if code_line and _IMPORT_LINE_RE.search(source, code_line.end()):
+            issues.append(f"Cell {index}: Import statement after other code")
+    
+    # Check for hardcoded secrets and risky calls (basic check)
+    found = []
+    for match in _CELL_RULES_RE.finditer(source):
+        if match.lastgroup not in found:
+            found.append(match.lastgroup)
+    for name in found:
+        issues.append(f"Cell {index}: {_CELL_RULE_ISSUES[name]}")
+
+
+# Directories that never hold notebooks worth validating
+_SKIP_DIRS = frozenset({
+    '.git', '.ipynb_checkpoints', '__pycache__', 'node_modules', '.venv', 'venv'
+})
+
+
+def _iter_ipynb(directory):
+    """Yield notebook paths under a directory, using the stat info cached by scandir."""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in _SKIP_DIRS:
+                    yield from _iter_ipynb(entry.path)
+            elif entry.name.endswith('.ipynb'):
+                yield entry.path
+
+
+def _validate_one(notebook_path):
+    """Worker: validate one notebook, returning its path alongside the issues."""
+    return notebook_path, validate_notebook(notebook_path)
 
 
 def validate_notebooks_in_directory(directory):
     """Validate all notebooks in a directory."""
-    validator = NotebookValidator()
-    results = {}
+    notebook_paths = list(_iter_ipynb(directory))
     
-    for root, dirs, files in os.walk(directory):
-        for file in files:
-            if file.endswith('.ipynb'):
-                notebook_path = os.path.join(root, file)
-                issues = validator.validate_notebook(notebook_path)
-                if issues:
-                    results[notebook_path] = issues
+    # Notebooks are independent, so validate them across processes; unordered
+    # results balance uneven notebook sizes and are put back in walk order below
+    if len(notebook_paths) > 1:
+        with multiprocessing.Pool(os.cpu_count()) as pool:
+            found = dict(
+                pool.imap_unordered(_validate_one, notebook_paths, chunksize=8)
+            )
+    else:
+        found = dict(map(_validate_one, notebook_paths))
     
-    return results
+    return {path: found[path] for path in notebook_paths if found[path]}
 
 
 def main():
@@ -166,14 +307,12 @@ def main():
         print(f"Error: Path '{path}' does not exist")
         return 1
     
-    validator = NotebookValidator()
-    
     if path.is_file():
         if not path.suffix == '.ipynb':
             print(f"Error: '{path}' is not a notebook file")
             return 1
         
-        issues = validator.validate_notebook(str(path))
+        issues = validate_notebook(str(path))
         if issues:
             print(f"\n{path}:")
             for issue in issues:
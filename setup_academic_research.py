@@ -8,10 +8,14 @@ specifically designed for non-technical academic researchers.
 
 import os
 import sys
+import shutil
 import subprocess
 from pathlib import Path
 
 
+RESOURCES_DIR = Path(__file__).parent / 'ai_assistant' / 'resources'
+
+
 def install_academic_dependencies():
     """Install academic research specific dependencies."""
     print("📚 Installing Academic Research Dependencies")
@@ -24,12 +28,15 @@ def install_academic_dependencies():
         'plotly>=5.15.0',       # Interactive visualizations
         'statsmodels>=0.14.0',  # Advanced statistical models
         'scikit-learn>=1.3.0',  # Machine learning tools
+        'pyarrow>=14.0.0',      # Fast multithreaded CSV loading
+        'numba>=0.58.0',        # JIT-compiled cleaning kernels
         
         # Academic data access
         'arxiv>=1.4.0',         # arXiv paper access
         'biopython>=1.81',      # PubMed/NCBI access
         'wbdata>=0.3.0',        # World Bank data
         'requests>=2.28.0',     # API access
+        'diskcache>=5.6.0',     # On-disk cache for search results
         
         # Text analysis for qualitative research
         'nltk>=3.8',            # Natural language processing
@@ -42,18 +49,38 @@ def install_academic_dependencies():
         # Optional advanced libraries
         'spacy>=3.4.0',         # Advanced NLP (optional)
         'lifelines>=0.27.0',    # Survival analysis (optional)
+        'fireducks>=1.0.0',     # Compiled pandas drop-in (optional, Linux)
     ]
     
-    for dep in academic_deps:
-        try:
-            subprocess.check_call([sys.executable, '-m', 'pip', 'install', dep])
-            print(f"✅ Installed {dep}")
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Failed to install {dep}: {e}")
+    # One pip run resolves everything together; if it fails, retry per package
+    # so one unavailable package does not block the rest
+    try:
+        subprocess.check_call([sys.executable, '-m', 'pip', 'install', *academic_deps])
+        print(f"✅ Installed {len(academic_deps)} packages")
+    except subprocess.CalledProcessError:
+        for dep in academic_deps:
+            try:
+                subprocess.check_call([sys.executable, '-m', 'pip', 'install', dep])
+                print(f"✅ Installed {dep}")
+            except subprocess.CalledProcessError as e:
+                print(f"❌ Failed to install {dep}: {e}")
     
     return True
 
 
+def _write_csv(df, path):
+    """Write a DataFrame as CSV, with pyarrow's C++ writer when it is installed."""
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        df.to_csv(path, index=False)
+        return
+    
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pa_csv.write_csv(table, str(path), write_options=pa_csv.WriteOptions(quoting_style='needed'))
+
+
 def create_sample_data():
     """Create sample research datasets for demonstration."""
     print("\n📊 Creating Sample Research Datasets")
@@ -67,78 +94,64 @@ def create_sample_data():
     data_dir.mkdir(exist_ok=True)
     
     # 1. Survey Research Dataset
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
     n = 150
     
     survey_data = pd.DataFrame({
-        'participant_id': range(1, n + 1),
-        'age': np.random.normal(28, 8, n).astype(int),
-        'gender': np.random.choice(['Male', 'Female', 'Other'], n, p=[0.45, 0.50, 0.05]),
-        'education': np.random.choice(['High School', 'Bachelor', 'Master', 'PhD'], n, p=[0.2, 0.4, 0.3, 0.1]),
-        'job_satisfaction': np.random.normal(5.5, 1.3, n),
-        'work_life_balance': np.random.normal(5.2, 1.4, n),
-        'salary_satisfaction': np.random.normal(4.8, 1.5, n),
-        'career_growth': np.random.normal(5.0, 1.2, n),
-        'overall_happiness': np.random.normal(5.8, 1.1, n)
+        'participant_id': np.arange(1, n + 1),
+        'age': rng.normal(28, 8, n).astype(int),
+        'gender': rng.choice(['Male', 'Female', 'Other'], n, p=[0.45, 0.50, 0.05]),
+        'education': rng.choice(['High School', 'Bachelor', 'Master', 'PhD'], n, p=[0.2, 0.4, 0.3, 0.1]),
+        'job_satisfaction': rng.normal(5.5, 1.3, n),
+        'work_life_balance': rng.normal(5.2, 1.4, n),
+        'salary_satisfaction': rng.normal(4.8, 1.5, n),
+        'career_growth': rng.normal(5.0, 1.2, n),
+        'overall_happiness': rng.normal(5.8, 1.1, n)
     })
     
     # Add some missing values
-    missing_idx = np.random.choice(n, size=int(0.05 * n), replace=False)
+    missing_idx = rng.choice(n, size=int(0.05 * n), replace=False)
     survey_data.loc[missing_idx, 'salary_satisfaction'] = np.nan
     
-    survey_data.to_csv(data_dir / 'workplace_satisfaction_survey.csv', index=False)
+    _write_csv(survey_data, data_dir / 'workplace_satisfaction_survey.csv')
     print("✅ Created workplace_satisfaction_survey.csv")
     
     # 2. Experimental Study Dataset
-    np.random.seed(123)
+    rng = np.random.default_rng(123)
     n_per_group = 40
     
-    # Control group
-    control = pd.DataFrame({
-        'participant_id': range(1, n_per_group + 1),
-        'group': 'Control',
-        'pre_test': np.random.normal(72, 10, n_per_group),
-        'post_test': np.random.normal(75, 12, n_per_group),
-        'motivation': np.random.normal(6.0, 1.2, n_per_group),
-        'engagement': np.random.normal(5.8, 1.3, n_per_group)
-    })
-    
-    # Treatment group
-    treatment = pd.DataFrame({
-        'participant_id': range(n_per_group + 1, 2 * n_per_group + 1),
-        'group': 'Treatment',
-        'pre_test': np.random.normal(73, 9, n_per_group),
-        'post_test': np.random.normal(83, 10, n_per_group),  # Higher scores
-        'motivation': np.random.normal(7.2, 1.1, n_per_group),  # Higher motivation
-        'engagement': np.random.normal(6.8, 1.2, n_per_group)   # Higher engagement
+    # Control group first, then treatment; the treatment means are higher
+    experimental_data = pd.DataFrame({
+        'participant_id': np.arange(1, 2 * n_per_group + 1),
+        'group': np.repeat(['Control', 'Treatment'], n_per_group),
+        'pre_test': rng.normal(np.repeat([72, 73], n_per_group), np.repeat([10, 9], n_per_group)),
+        'post_test': rng.normal(np.repeat([75, 83], n_per_group), np.repeat([12, 10], n_per_group)),
+        'motivation': rng.normal(np.repeat([6.0, 7.2], n_per_group), np.repeat([1.2, 1.1], n_per_group)),
+        'engagement': rng.normal(np.repeat([5.8, 6.8], n_per_group), np.repeat([1.3, 1.2], n_per_group))
     })
-    
-    experimental_data = pd.concat([control, treatment], ignore_index=True)
-    experimental_data.to_csv(data_dir / 'learning_intervention_study.csv', index=False)
+    _write_csv(experimental_data, data_dir / 'learning_intervention_study.csv')
     print("✅ Created learning_intervention_study.csv")
     
     # 3. Longitudinal Study Dataset
-    np.random.seed(456)
+    rng = np.random.default_rng(456)
     n_participants = 60
     n_timepoints = 4
     
-    longitudinal_data = []
-    for participant in range(1, n_participants + 1):
-        baseline_score = np.random.normal(50, 10)
-        for timepoint in range(1, n_timepoints + 1):
-            # Simulate improvement over time with some noise
-            score = baseline_score + (timepoint - 1) * 2 + np.random.normal(0, 3)
-            longitudinal_data.append({
-                'participant_id': participant,
-                'timepoint': timepoint,
-                'month': timepoint * 3,  # Every 3 months
-                'wellbeing_score': score,
-                'stress_level': np.random.normal(5 - timepoint * 0.3, 1.2),  # Decreasing stress
-                'social_support': np.random.normal(4 + timepoint * 0.2, 1.0)  # Increasing support
-            })
-    
-    longitudinal_df = pd.DataFrame(longitudinal_data)
-    longitudinal_df.to_csv(data_dir / 'wellbeing_longitudinal_study.csv', index=False)
+    # One row per (participant, timepoint), participant-major
+    participant_id = np.repeat(np.arange(1, n_participants + 1), n_timepoints)
+    timepoint = np.tile(np.arange(1, n_timepoints + 1), n_participants)
+    baseline_score = np.repeat(rng.normal(50, 10, n_participants), n_timepoints)
+    
+    longitudinal_df = pd.DataFrame({
+        'participant_id': participant_id,
+        'timepoint': timepoint,
+        'month': timepoint * 3,  # Every 3 months
+        # Simulate improvement over time with some noise
+        'wellbeing_score': baseline_score + (timepoint - 1) * 2 + rng.normal(0, 3, timepoint.size),
+        'stress_level': rng.normal(5 - timepoint * 0.3, 1.2),  # Decreasing stress
+        'social_support': rng.normal(4 + timepoint * 0.2, 1.0)  # Increasing support
+    })
+    _write_csv(longitudinal_df, data_dir / 'wellbeing_longitudinal_study.csv')
     print("✅ Created wellbeing_longitudinal_study.csv")
     
     print(f"\n📁 Sample datasets created in: {data_dir.absolute()}")
@@ -153,91 +166,9 @@ def create_academic_templates():
     templates_dir = Path('notebooks/templates')
     templates_dir.mkdir(exist_ok=True)
     
-    # Survey Research Template
-    survey_template = '''
-{
- "cells": [
-  {
-   "cell_type": "markdown",
-   "metadata": {},
-   "source": [
-    "# Survey Research Analysis Template\\n",
-    "\\n",
-    "This template guides you through analyzing survey data with AI assistance.\\n",
-    "\\n",
-    "## Research Question\\n",
-    "**Replace with your research question:** What factors predict workplace satisfaction?\\n",
-    "\\n",
-    "## Dataset\\n",
-    "**Replace with your CSV file:** workplace_satisfaction_survey.csv"
-   ]
-  },
-  {
-   "cell_type": "code",
-   "execution_count": null,
-   "metadata": {},
-   "outputs": [],
-   "source": [
-    "# Setup\\n",
-    "%load_ext ai_assistant.research.academic_magic"
-   ]
-  },
-  {
-   "cell_type": "code",
-   "execution_count": null,
-   "metadata": {},
-   "outputs": [],
-   "source": [
-    "# Load your data\\n",
-    "%research_load your_survey_data.csv --research_question \\"Your research question here\\""
-   ]
-  },
-  {
-   "cell_type": "code",
-   "execution_count": null,
-   "metadata": {},
-   "outputs": [],
-   "source": [
-    "# Explore and clean data\\n",
-    "%research_eda\\n",
-    "%research_clean --interactive"
-   ]
-  },
-  {
-   "cell_type": "code",
-   "execution_count": null,
-   "metadata": {},
-   "outputs": [],
-   "source": [
-    "# Statistical analysis\\n",
-    "%research_stats --variables \\"var1,var2,var3\\""
-   ]
-  },
-  {
-   "cell_type": "code",
-   "execution_count": null,
-   "metadata": {},
-   "outputs": [],
-   "source": [
-    "# Generate report\\n",
-    "%research_report"
-   ]
-  }
- ],
- "metadata": {
-  "kernelspec": {
-   "display_name": "Python 3",
-   "language": "python",
-   "name": "python3"
-  }
- },
- "nbformat": 4,
- "nbformat_minor": 4
-}
-'''
-    
-    with open(templates_dir / 'survey_research_template.ipynb', 'w') as f:
-        f.write(survey_template)
+    # Survey Research Template, copied as-is from the package resources
+    shutil.copyfile(RESOURCES_DIR / 'survey_research_template.ipynb',
+                    templates_dir / 'survey_research_template.ipynb')
     print("✅ Created survey_research_template.ipynb")
     
     return True
@@ -12,19 +12,30 @@ import os
 import sys
 import subprocess
 import shutil
+import tempfile
 from pathlib import Path
 
 
-def run_command(command, description):
-    """Run a command and handle errors."""
+# Bytes of command output shown when a command fails
+ERROR_TAIL_BYTES = 4096
+
+
+def run_command(argv, description):
+    """Run a command, given as an argument list, and handle errors."""
     print(f"🔄 {description}...")
-    try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
-        print(f"✅ {description} completed successfully")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ {description} failed: {e.stderr}")
-        return False
+    # Output goes to a temporary file rather than memory, since pip can print
+    # megabytes of build logs; only the tail is read back, and only on failure
+    with tempfile.TemporaryFile() as log:
+        try:
+            # No shell: the command is exec'd directly instead of through /bin/sh
+            subprocess.run(argv, check=True, stdout=log, stderr=subprocess.STDOUT)
+            print(f"✅ {description} completed successfully")
+            return True
+        except subprocess.CalledProcessError:
+            log.seek(max(log.tell() - ERROR_TAIL_BYTES, 0))
+            tail = log.read().decode('utf-8', errors='replace')
+            print(f"❌ {description} failed: {tail}")
+            return False
 
 
 def check_python_version():
@@ -42,7 +53,8 @@ def install_dependencies():
     print("=" * 50)
     
     # Install main requirements
-    if not run_command("pip install -r requirements.txt", "Installing main dependencies"):
+    if not run_command([sys.executable, '-m', 'pip', 'install', '-r', 'requirements.txt'],
+                       "Installing main dependencies"):
         return False
     
     
@@ -0,0 +1,93 @@
+"""
+Tests for the academic research magic commands.
+"""
+
+import sys
+import time
+import types
+import functools
+import importlib
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ai_assistant import magic_commands
+from ai_assistant.response_cache import ResponseCache
+
+
+def _import_academic_magic():
+    """Import academic_magic, even though the research package __init__ lists modules not in this tree."""
+    try:
+        return importlib.import_module('ai_assistant.research.academic_magic')
+    except ImportError:
+        package = types.ModuleType('ai_assistant.research')
+        package.__path__ = [str(Path(__file__).parent / 'ai_assistant' / 'research')]
+        sys.modules['ai_assistant.research'] = package
+        return importlib.import_module('ai_assistant.research.academic_magic')
+
+
+@pytest.fixture
+def magics(monkeypatch):
+    """Research magics with no provider clients and an in-memory response cache."""
+    for key in ('OPENAI_API_KEY', 'ANTHROPIC_API_KEY', 'GOOGLE_API_KEY'):
+        monkeypatch.delenv(key, raising=False)
+    monkeypatch.setattr(magic_commands, 'ResponseCache', functools.partial(ResponseCache, None))
+
+    academic_magic = _import_academic_magic()
+    instance = academic_magic.AcademicResearchMagics()
+    yield academic_magic, instance
+    instance.close()
+
+
+def test_research_eda_does_not_wait_for_sweetviz(magics, monkeypatch, tmp_path):
+    """The summary and heatmap are shown while a slow SweetViz report is still building."""
+    academic_magic, instance = magics
+    release = threading.Event()
+    finished = threading.Event()
+    reported = threading.Event()
+
+    class SlowReport:
+        def show_html(self, path, open_browser=False):
+            release.wait(10)
+            finished.set()
+
+    monkeypatch.setitem(sys.modules, 'sweetviz',
+                        types.SimpleNamespace(analyze=lambda df: SlowReport()))
+    monkeypatch.setattr(academic_magic, 'SWEETVIZ_AVAILABLE', True)
+    monkeypatch.chdir(tmp_path)
+
+    build_report = instance._build_sweetviz_report
+
+    async def build_and_signal(*args, **kwargs):
+        await build_report(*args, **kwargs)
+        reported.set()
+
+    monkeypatch.setattr(instance, '_build_sweetviz_report', build_and_signal)
+
+    shown = []
+
+    def display(obj, display_id=None):
+        shown.append(obj)
+        if display_id:
+            return types.SimpleNamespace(update=shown.append)
+
+    monkeypatch.setattr(academic_magic, 'display', display)
+
+    rng = np.random.default_rng(0)
+    instance.current_dataset = pd.DataFrame(rng.normal(size=(50, 3)), columns=['a', 'b', 'c'])
+
+    start = time.perf_counter()
+    instance.research_eda('')
+    elapsed = time.perf_counter() - start
+
+    assert not finished.is_set()
+    assert elapsed < 5
+    assert any(isinstance(obj, academic_magic.Image) for obj in shown)
+
+    release.set()
+    assert finished.wait(5)
+    assert reported.wait(5)
+    assert 'SweetViz report generated' in shown[-1].data
@@ -0,0 +1,151 @@
+"""
+Tests for the AI assistant magic commands.
+"""
+
+import asyncio
+import functools
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from ai_assistant import magic_commands, retry
+from ai_assistant.magic_commands import AIAssistantMagics
+from ai_assistant.response_cache import ResponseCache
+
+
+def _magics_with_namespace(user_ns):
+    """A stand-in for the magics object carrying only what _eval_cell needs."""
+    shell = SimpleNamespace(transform_cell=lambda cell: cell, user_ns=user_ns)
+    return SimpleNamespace(shell=shell)
+
+
+def test_eval_cell_returns_trailing_expression():
+    """A cell ending in an expression runs once and yields that expression."""
+    user_ns = {'pd': pd, 'calls': []}
+    magics = _magics_with_namespace(user_ns)
+
+    result = AIAssistantMagics._eval_cell(
+        magics, "calls.append(1)\npd.DataFrame({'a': [1, 2]})"
+    )
+
+    assert isinstance(result, pd.DataFrame)
+    assert list(result['a']) == [1, 2]
+    assert user_ns['calls'] == [1]
+    assert '_ai_insight_result' not in user_ns
+
+
+def test_eval_cell_runs_and_returns_trailing_assignment():
+    """A cell ending in an assignment is still executed and yields the bound value."""
+    user_ns = {'pd': pd}
+    magics = _magics_with_namespace(user_ns)
+
+    result = AIAssistantMagics._eval_cell(magics, "df = pd.DataFrame({'a': [3]})")
+
+    assert isinstance(result, pd.DataFrame)
+    assert user_ns['df'] is result
+
+
+def test_eval_cell_runs_other_statements():
+    """A cell ending in some other statement runs but yields nothing."""
+    user_ns = {}
+    magics = _magics_with_namespace(user_ns)
+
+    result = AIAssistantMagics._eval_cell(magics, "for i in range(3):\n    total = i")
+
+    assert result is None
+    assert user_ns['total'] == 2
+
+
+class _RateLimited(Exception):
+    status_code = 429
+
+
+class _RecordingLimiter:
+    """Stands in for ProviderLimiter and records slot and token use."""
+
+    def __init__(self, events):
+        self.events = events
+        self.held = 0
+
+    async def __aenter__(self):
+        self.held += 1
+        self.events.append('enter')
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.held -= 1
+        self.events.append('exit')
+
+    async def acquire(self, prompt):
+        self.events.append('acquire')
+
+
+class _StreamingClient:
+    """OpenAI-shaped streaming client whose first `failures` requests are rate limited."""
+
+    def __init__(self, failures=0):
+        self.calls = 0
+        self.failures = failures
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise _RateLimited()
+        return self._stream()
+
+    async def _stream(self):
+        for text in ('Hel', 'lo'):
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+@pytest.fixture
+def magics(monkeypatch):
+    """Magics with no configured providers and an in-memory response cache."""
+    for key in ('OPENAI_API_KEY', 'ANTHROPIC_API_KEY', 'GOOGLE_API_KEY', 'AI_ASSIST_SEMANTIC_CACHE'):
+        monkeypatch.delenv(key, raising=False)
+    monkeypatch.setattr(magic_commands, 'ResponseCache', functools.partial(ResponseCache, None))
+
+    instance = AIAssistantMagics()
+    yield instance
+    instance.close()
+
+
+def test_stream_retries_outside_the_limiter(magics, monkeypatch):
+    """Each streaming attempt takes its own slot and tokens; backoff holds no slot."""
+    events = []
+    limiter = _RecordingLimiter(events)
+    client = _StreamingClient(failures=1)
+    magics.clients['openai'] = client
+    magics.async_clients['openai'] = client
+    magics._limiters['openai'] = limiter
+
+    async def sleep(seconds):
+        events.append(('sleep', limiter.held))
+
+    monkeypatch.setattr(retry, 'asyncio', SimpleNamespace(sleep=sleep))
+
+    async def collect():
+        return [text async for text in magics._stream_ai_response_async('hi', 'openai', 0.7)]
+
+    assert asyncio.run(collect()) == ['Hel', 'lo']
+    assert client.calls == 2
+    assert events == ['enter', 'acquire', 'exit', ('sleep', 0),
+                      'enter', 'acquire', 'exit']
+
+
+def test_repeated_ai_code_is_served_from_cache(magics, monkeypatch):
+    """%%ai_code defaults to a cacheable temperature, so a repeat never reaches the provider."""
+    client = _StreamingClient()
+    magics.clients['openai'] = client
+    magics.async_clients['openai'] = client
+    shown = []
+    monkeypatch.setattr(magic_commands, 'display',
+                        lambda obj, display_id=None: SimpleNamespace(update=shown.append))
+
+    magics.ai_code('--model openai', 'def f():\n    return 1')
+    magics.ai_code('--model openai', 'def f():\n    return 1')
+
+    assert client.calls == 1
+    assert shown[-1].data.endswith('Hello')
@@ -0,0 +1,37 @@
+"""
+Tests for the multi-model playground.
+"""
+
+import asyncio
+
+import pytest
+
+from ai_assistant.model_playground import ModelPlayground
+
+
+@pytest.fixture
+def playground(monkeypatch):
+    """A playground offering gpt-4 without a real client, and the semantic cache off."""
+    monkeypatch.setattr(ModelPlayground, '_setup_clients',
+                        lambda self: self._dispatch.update({'gpt-4': None}))
+    monkeypatch.delenv('AI_ASSIST_PLAYGROUND_SEMANTIC_CACHE', raising=False)
+
+    instance = ModelPlayground()
+    yield instance
+    instance.close()
+
+
+def test_timeout_is_reported_not_recorded(playground, monkeypatch):
+    """A timed-out model shows an error in its pane and never reaches history or usage."""
+    async def hang(model, prompt, temperature, max_tokens, stream):
+        raise asyncio.TimeoutError()
+
+    monkeypatch.setattr(playground, '_aget_model_response', hang)
+    asyncio.run(playground._arun_models(['gpt-4'], 'hi', 0.7, 100))
+
+    assert not playground.responses
+    assert playground.total_cost == 0
+    assert not playground._usage_count.any()
+    output, = playground._per_model_outputs['gpt-4'].outputs
+    assert output['name'] == 'stderr'
+    assert 'timed out' in output['text']
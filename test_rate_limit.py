@@ -0,0 +1,100 @@
+"""
+Tests for client-side provider rate limiting.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from ai_assistant import rate_limit
+from ai_assistant.rate_limit import ProviderLimiter, TokenBucket, get_provider_limits
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Replace the module's clock and sleep with a manual clock that sleep advances."""
+    clock = SimpleNamespace(now=1000.0, sleeps=[])
+
+    async def sleep(seconds):
+        clock.sleeps.append(seconds)
+        clock.now += seconds
+
+    monkeypatch.setattr(rate_limit, 'time', SimpleNamespace(monotonic=lambda: clock.now))
+    monkeypatch.setattr(rate_limit, 'asyncio',
+                        SimpleNamespace(sleep=sleep, Semaphore=asyncio.Semaphore))
+    return clock
+
+
+def test_bucket_starts_full(fake_clock):
+    """A fresh bucket serves its whole per-minute budget without waiting."""
+    bucket = TokenBucket(60)
+
+    asyncio.run(bucket.acquire(60))
+
+    assert fake_clock.sleeps == []
+    assert bucket.tokens == pytest.approx(0)
+
+
+def test_bucket_waits_for_refill(fake_clock):
+    """An empty bucket waits exactly long enough for the refill at rpm/60 per second."""
+    bucket = TokenBucket(60)
+    asyncio.run(bucket.acquire(60))
+
+    asyncio.run(bucket.acquire(3))
+
+    assert fake_clock.sleeps == [pytest.approx(3.0)]
+    assert bucket.tokens == pytest.approx(0)
+
+
+def test_bucket_refill_is_capped(fake_clock):
+    """Idle time never refills a bucket past its capacity."""
+    bucket = TokenBucket(60)
+    asyncio.run(bucket.acquire(30))
+    fake_clock.now += 3600
+
+    bucket._refill()
+
+    assert bucket.tokens == pytest.approx(60)
+
+
+def test_oversized_request_is_clamped(fake_clock):
+    """A request larger than the capacity waits for a full bucket instead of forever."""
+    bucket = TokenBucket(10)
+
+    asyncio.run(bucket.acquire(1000))
+
+    assert fake_clock.sleeps == []
+    assert bucket.tokens == pytest.approx(0)
+
+
+def test_env_overrides(monkeypatch):
+    """AI_ASSIST_<PROVIDER>_<LIMIT> overrides the defaults for that provider only."""
+    monkeypatch.setenv('AI_ASSIST_OPENAI_RPM', '5')
+    monkeypatch.setenv('AI_ASSIST_OPENAI_TPM', '1000')
+    monkeypatch.delenv('AI_ASSIST_OPENAI_CONCURRENCY', raising=False)
+
+    limits = get_provider_limits('openai')
+
+    assert limits['rpm'] == 5
+    assert limits['tpm'] == 1000
+    assert limits['concurrency'] == rate_limit.PROVIDER_LIMITS['openai']['concurrency']
+    assert rate_limit.PROVIDER_LIMITS['openai']['rpm'] != 5
+
+
+def test_limiter_charges_requests_and_tokens(fake_clock, monkeypatch):
+    """Each acquire takes one request and about a quarter token per prompt character."""
+    monkeypatch.setenv('AI_ASSIST_ANTHROPIC_RPM', '60')
+    monkeypatch.setenv('AI_ASSIST_ANTHROPIC_TPM', '600')
+
+    async def run():
+        limiter = ProviderLimiter('anthropic')
+        async with limiter:
+            await limiter.acquire('x' * 400)
+        return limiter
+
+    limiter = asyncio.run(run())
+
+    assert limiter.requests.tokens == pytest.approx(59)
+    assert limiter.tokens.tokens == pytest.approx(500)
+    assert fake_clock.sleeps == []
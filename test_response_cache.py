@@ -0,0 +1,92 @@
+"""
+Tests for the two-tier AI response cache.
+"""
+
+import numpy as np
+
+from ai_assistant.response_cache import ResponseCache
+
+
+def _line_count(path):
+    with open(path, encoding='utf-8') as f:
+        return sum(1 for _ in f)
+
+
+def test_exact_hit_and_temperature_bucket(tmp_path):
+    """Exact hits match on model, prompt and temperature rounded to one decimal."""
+    cache = ResponseCache(tmp_path / 'cache.jsonl')
+    cache.put('openai', 'hello', 0.2, 'hi')
+
+    assert cache.get('openai', 'hello', 0.21) == 'hi'
+    assert cache.get('openai', 'hello', 0.3) is None
+    assert cache.get('anthropic', 'hello', 0.2) is None
+
+
+def test_temperature_cutoff():
+    """Only low-temperature responses are cacheable."""
+    cache = ResponseCache(None, max_temperature=0.3)
+
+    assert cache.is_cacheable(0.3)
+    assert not cache.is_cacheable(0.7)
+
+
+def test_lru_eviction():
+    """The least recently used entry is evicted once the bound is exceeded."""
+    cache = ResponseCache(None, max_entries=2)
+    cache.put('m', 'a', 0, 'A')
+    cache.put('m', 'b', 0, 'B')
+    cache.get('m', 'a', 0)
+    cache.put('m', 'c', 0, 'C')
+
+    assert cache.get('m', 'a', 0) == 'A'
+    assert cache.get('m', 'b', 0) is None
+    assert cache.get('m', 'c', 0) == 'C'
+
+
+def test_similarity_threshold():
+    """Semantic hits need a cosine similarity at or above the threshold, for the same model."""
+    cache = ResponseCache(None, similarity_threshold=0.95)
+    cache.put('m', 'prompt', 0, 'answer', np.array([1.0, 0.0], dtype=np.float32))
+
+    assert cache.get_similar('m', np.array([0.99, 0.05], dtype=np.float32)) == 'answer'
+    assert cache.get_similar('m', np.array([0.5, 0.5], dtype=np.float32)) is None
+    assert cache.get_similar('other', np.array([1.0, 0.0], dtype=np.float32)) is None
+
+
+def test_reload_from_disk(tmp_path):
+    """Entries, including embeddings, survive a reload from the JSONL file."""
+    path = tmp_path / 'cache.jsonl'
+    cache = ResponseCache(path)
+    cache.put('m', 'exact', 0, 'one')
+    cache.put('m', 'semantic', 0, 'two', np.array([0.0, 1.0], dtype=np.float32))
+
+    reloaded = ResponseCache(path)
+
+    assert reloaded.get('m', 'exact', 0) == 'one'
+    assert reloaded.get_similar('m', np.array([0.0, 1.0], dtype=np.float32)) == 'two'
+
+
+def test_file_is_compacted(tmp_path):
+    """The file is rewritten from memory instead of growing past twice the bound."""
+    path = tmp_path / 'cache.jsonl'
+    cache = ResponseCache(path, max_entries=3)
+    for i in range(20):
+        cache.put('m', f'prompt {i}', 0, f'response {i}')
+        assert _line_count(path) <= 2 * cache.max_entries
+
+    reloaded = ResponseCache(path, max_entries=3)
+    assert reloaded.get('m', 'prompt 19', 0) == 'response 19'
+    assert reloaded.get('m', 'prompt 0', 0) is None
+    assert not (tmp_path / 'cache.jsonl.tmp').exists()
+
+
+def test_oversized_file_is_compacted_on_load(tmp_path):
+    """A file left oversized by an older version is trimmed when loaded."""
+    path = tmp_path / 'cache.jsonl'
+    writer = ResponseCache(path, max_entries=100)
+    for i in range(50):
+        writer.put('m', f'prompt {i}', 0, f'response {i}')
+
+    ResponseCache(path, max_entries=5)
+
+    assert _line_count(path) == 5
@@ -0,0 +1,120 @@
+"""
+Tests for retrying transient AI provider failures.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from ai_assistant import retry
+from ai_assistant.retry import is_retryable, with_retry
+
+
+class StatusError(Exception):
+    """Provider-style error carrying an HTTP status code."""
+
+    def __init__(self, status_code=None, code=None):
+        super().__init__(f'status {status_code or code}')
+        self.status_code = status_code
+        self.code = code
+
+
+@pytest.fixture
+def fake_sleep(monkeypatch):
+    """Record backoff delays instead of sleeping; jitter returns its upper bound."""
+    sleeps = []
+
+    async def sleep(seconds):
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(retry, 'asyncio', SimpleNamespace(sleep=sleep))
+    monkeypatch.setattr(retry, 'random', SimpleNamespace(uniform=lambda low, high: high))
+    return sleeps
+
+
+def _flaky(failures):
+    """A coroutine factory that raises each of `failures` in turn, then succeeds."""
+    calls = []
+
+    async def call():
+        calls.append(len(calls))
+        if len(calls) <= len(failures):
+            raise failures[len(calls) - 1]
+        return 'ok'
+
+    return call, calls
+
+
+@pytest.mark.parametrize('status', [429, 500, 502, 503, 504])
+def test_transient_statuses_are_retryable(status):
+    assert is_retryable(StatusError(status_code=status))
+
+
+def test_google_code_is_retryable():
+    """google.api_core errors carry the status as `code`."""
+    assert is_retryable(StatusError(code=503))
+
+
+@pytest.mark.parametrize('exc', [StatusError(status_code=400), StatusError(status_code=401),
+                                 ValueError('bad input')])
+def test_client_errors_are_not_retryable(exc):
+    assert not is_retryable(exc)
+
+
+def test_connection_errors_are_retryable(monkeypatch):
+    """Connection errors from an already-imported SDK are retried."""
+    class APIConnectionError(Exception):
+        pass
+
+    monkeypatch.setitem(retry.sys.modules, 'openai',
+                        SimpleNamespace(APIConnectionError=APIConnectionError))
+
+    assert is_retryable(APIConnectionError())
+
+
+def test_retries_with_exponential_backoff(fake_sleep):
+    """Transient failures are retried, with the jitter bound doubling each attempt."""
+    call, calls = _flaky([StatusError(429), StatusError(503)])
+
+    assert asyncio.run(with_retry(call, base=0.5)) == 'ok'
+    assert len(calls) == 3
+    assert fake_sleep == [0.5, 1.0]
+
+
+def test_non_retryable_error_is_raised_immediately(fake_sleep):
+    call, calls = _flaky([StatusError(400)])
+
+    with pytest.raises(StatusError):
+        asyncio.run(with_retry(call))
+    assert len(calls) == 1
+    assert fake_sleep == []
+
+
+def test_gives_up_after_max_retries(fake_sleep):
+    call, calls = _flaky([StatusError(500)] * 10)
+
+    with pytest.raises(StatusError):
+        asyncio.run(with_retry(call, max_retries=2, base=1.0))
+    assert len(calls) == 3
+    assert fake_sleep == [1.0, 2.0]
+
+
+def test_jitter_is_drawn_from_zero(monkeypatch):
+    """Full jitter draws each delay uniformly from [0, base * 2**attempt]."""
+    bounds = []
+
+    async def sleep(seconds):
+        pass
+
+    def uniform(low, high):
+        bounds.append((low, high))
+        return 0.0
+
+    monkeypatch.setattr(retry, 'asyncio', SimpleNamespace(sleep=sleep))
+    monkeypatch.setattr(retry, 'random', SimpleNamespace(uniform=uniform))
+    call, _ = _flaky([StatusError(429)] * 3)
+
+    asyncio.run(with_retry(call, base=0.25))
+
+    assert bounds == [(0, 0.25), (0, 0.5), (0, 1.0)]
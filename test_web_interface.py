@@ -0,0 +1,42 @@
+"""
+Tests for the web interface's notebook routes.
+"""
+
+import pytest
+
+from web_interface import app as web_app
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # The viewer template is rendered elsewhere; only the route logic is under test
+    monkeypatch.setattr(web_app, 'render_template', lambda template, **context: 'rendered')
+    return web_app.app.test_client()
+
+
+def test_valid_notebook_is_served(client):
+    assert client.get('/notebook/ai_assistant_demo.ipynb').status_code == 200
+
+    response = client.get('/api/notebook/ai_assistant_demo.ipynb/metadata')
+    assert response.status_code == 200
+    assert response.json['cells'] > 0
+
+
+@pytest.mark.parametrize('url', [
+    '/notebook/../README.md',
+    '/notebook/..%2fREADME.md',
+    '/notebook/..%2f..%2fetc%2fpasswd',
+    '/api/notebook/../README.md/metadata',
+    '/api/notebook/..%2fREADME.md/metadata',
+])
+def test_paths_outside_notebooks_are_rejected(client, url):
+    assert client.get(url).status_code == 404
+
+
+def test_notebook_file_stays_under_root():
+    """The resolver itself refuses traversal, absolute paths and directories."""
+    assert web_app._notebook_file('../README.md') is None
+    assert web_app._notebook_file('/etc/passwd') is None
+    assert web_app._notebook_file('agents') is None
+    assert web_app._notebook_file('agents/../ai_assistant_demo.ipynb') == \
+        web_app.NOTEBOOKS_ROOT / 'ai_assistant_demo.ipynb'
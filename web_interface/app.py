@@ -7,40 +7,181 @@ This Flask application provides a web-based interface for:
 - AI assistant integration
 """
 
+import sys
+import importlib.util
+
+# When served directly and eventlet is installed, run Socket.IO on greenthreads so
+# many long-lived streams share one worker; the blocking SDK calls only cooperate
+# if the standard library is patched before anything else imports it
+if __name__ == '__main__' and importlib.util.find_spec('eventlet'):
+    import eventlet
+    eventlet.monkey_patch()
+    ASYNC_MODE = 'eventlet'
+elif importlib.util.find_spec('eventlet'):
+    # Under another server, an eventlet (or gevent) worker has already patched the
+    # standard library and Socket.IO should pick that mode itself; only an unpatched
+    # process must be kept off eventlet, whose blocking SDK calls would stall it
+    from eventlet import patcher
+    gevent_monkey = sys.modules.get('gevent.monkey')
+    if patcher.is_monkey_patched('socket') or (
+            gevent_monkey is not None and gevent_monkey.is_module_patched('socket')):
+        ASYNC_MODE = None
+    else:
+        ASYNC_MODE = 'threading'
+else:
+    ASYNC_MODE = None
+
 import os
 import json
+import time
 import asyncio
+import threading
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 from flask_socketio import SocketIO, emit
-import nbformat
-from nbconvert import HTMLExporter
-import openai
-import anthropic
-import google.generativeai as genai
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes with orjson, keeping Flask's output options."""
+    
+    def dumps(self, obj, **kwargs):
+        return self._dumps(obj).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._dumps(obj), mimetype=self.mimetype)
+    
+    def _dumps(self, obj) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option)
 
 
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'ai-notebooks-secret-key')
-socketio = SocketIO(app, cors_allowed_origins="*")
+# Prompts are small; refuse oversized bodies before reading or parsing them
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_CONTENT_LENGTH', 64 * 1024))
+socketio = SocketIO(app, async_mode=ASYNC_MODE, cors_allowed_origins="*")
 
 # Initialize AI clients
 ai_clients = {}
+# Snapshots of the configured model names (ordered, and for membership), refreshed by setup_ai_clients
+_MODEL_NAMES = ()
+_MODEL_SET = frozenset()
+
+# nbconvert and the provider SDKs are slow to import, so each is imported where it
+# is first needed; the HTML exporter is built on the first notebook view
+_html_exporter = None
+# An exporter keeps per-conversion state, so concurrent requests take turns with it
+_html_exporter_lock = threading.Lock()
+
+# Resolved once so requests don't depend on the working directory the server started in
+NOTEBOOKS_ROOT = (Path(__file__).parent.parent / 'notebooks').resolve()
+
+# Notebook listing snapshot; a directory's mtime only tracks its direct children,
+# so the snapshot also expires after a few seconds to pick up nested edits
+NOTEBOOK_LIST_TTL = 5.0
+_nb_cache = None
+_nb_cache_key = None
+_nb_cache_time = 0.0
+
+# ISO-formatted modification times, keyed on st_mtime_ns; oldest entries go first
+ISO_CACHE_SIZE = 4096
+_iso_cache = {}
+
+@functools.lru_cache(maxsize=1)
+def _build_ai_clients(openai_key, anthropic_key, google_key) -> dict:
+    """Construct the AI clients; cached so they are only rebuilt when a key changes."""
+    clients = {}
+    
+    if openai_key:
+        import openai
+        clients['openai'] = openai.OpenAI(api_key=openai_key)
+    
+    if anthropic_key:
+        import anthropic
+        clients['anthropic'] = anthropic.Anthropic(api_key=anthropic_key)
+    
+    if google_key:
+        import google.generativeai as genai
+        genai.configure(api_key=google_key)
+        clients['gemini'] = genai.GenerativeModel('gemini-pro')
+    
+    return clients
+
+
+def _iso(mtime_ns: int) -> str:
+    """Format a file modification time as ISO 8601, reusing earlier results."""
+    formatted = _iso_cache.get(mtime_ns)
+    if formatted is None:
+        formatted = datetime.fromtimestamp(mtime_ns / 1e9).isoformat()
+        if len(_iso_cache) >= ISO_CACHE_SIZE:
+            _iso_cache.pop(next(iter(_iso_cache)), None)
+        _iso_cache[mtime_ns] = formatted
+    return formatted
+
 
 def setup_ai_clients():
     """Initialize AI clients based on available API keys."""
-    global ai_clients
+    clients = _build_ai_clients(os.getenv('OPENAI_API_KEY'),
+                                os.getenv('ANTHROPIC_API_KEY'),
+                                os.getenv('GOOGLE_API_KEY'))
+    # Update in place so the cached dict is never handed out for mutation
+    global _MODEL_NAMES, _MODEL_SET
     
-    if os.getenv('OPENAI_API_KEY'):
-        ai_clients['openai'] = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+    ai_clients.clear()
+    ai_clients.update(clients)
+    _MODEL_NAMES = tuple(ai_clients)
+    _MODEL_SET = frozenset(ai_clients)
+
+
+@functools.lru_cache(maxsize=128)
+def _read_notebook(path: str, mtime_ns: int, size: int):
+    """Parse a notebook; keyed on mtime and size so an edited file is read again."""
+    import nbformat
     
-    if os.getenv('ANTHROPIC_API_KEY'):
-        ai_clients['anthropic'] = anthropic.Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
+    with open(path, 'r', encoding='utf-8') as f:
+        return nbformat.read(f, as_version=4)
+
+
+@functools.lru_cache(maxsize=128)
+def _render_notebook(path: str, mtime_ns: int, size: int) -> str:
+    """Render a notebook to HTML, reusing the result until the file changes."""
+    global _html_exporter
     
-    if os.getenv('GOOGLE_API_KEY'):
-        genai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
-        ai_clients['gemini'] = genai.GenerativeModel('gemini-pro')
+    nb = _read_notebook(path, mtime_ns, size)
+    with _html_exporter_lock:
+        if _html_exporter is None:
+            from nbconvert import HTMLExporter
+            # Validate once after the preprocessors instead of after each of them
+            _html_exporter = HTMLExporter(template_name='classic', optimistic_validation=True)
+        
+        (body, resources) = _html_exporter.from_notebook_node(nb)
+    return body
+
+
+def _notebook_file(notebook_path):
+    """Resolve a requested notebook, or return None if it is missing or outside the root."""
+    notebook_file = (NOTEBOOKS_ROOT / notebook_path).resolve()
+    # parents rather than Path.is_relative_to, which needs Python 3.9
+    if NOTEBOOKS_ROOT not in notebook_file.parents or not notebook_file.is_file():
+        return None
+    return notebook_file
 
 
 @app.route('/')
@@ -53,25 +194,19 @@ def index():
 @app.route('/playground')
 def playground():
     """Model playground page."""
-    available_models = list(ai_clients.keys())
-    return render_template('playground.html', models=available_models)
+    return render_template('playground.html', models=_MODEL_NAMES)
 
 
 @app.route('/notebook/<path:notebook_path>')
 def view_notebook(notebook_path):
     """View a notebook in HTML format."""
     try:
-        notebook_file = Path('notebooks') / notebook_path
-        if not notebook_file.exists():
+        notebook_file = _notebook_file(notebook_path)
+        if notebook_file is None:
             return "Notebook not found", 404
         
-        with open(notebook_file, 'r', encoding='utf-8') as f:
-            nb = nbformat.read(f, as_version=4)
-        
-        html_exporter = HTMLExporter()
-        html_exporter.template_name = 'classic'
-        
-        (body, resources) = html_exporter.from_notebook_node(nb)
+        stat = notebook_file.stat()
+        body = _render_notebook(str(notebook_file), stat.st_mtime_ns, stat.st_size)
         
         return render_template('notebook_viewer.html', 
                              notebook_html=body, 
@@ -85,7 +220,7 @@ def view_notebook(notebook_path):
 def api_models():
     """Get available AI models."""
     return jsonify({
-        'models': list(ai_clients.keys()),
+        'models': _MODEL_NAMES,
         'status': 'success'
     })
 
@@ -93,7 +228,10 @@ def api_models():
 @app.route('/api/chat', methods=['POST'])
 def api_chat():
     """Chat with AI models."""
-    data = request.json
+    if request.content_length and request.content_length > app.config['MAX_CONTENT_LENGTH']:
+        return jsonify({'error': 'Request too large'}), 413
+    
+    data = request.get_json(silent=True) or {}
     prompt = data.get('prompt', '')
     model = data.get('model', 'auto')
     temperature = data.get('temperature', 0.7)
@@ -101,10 +239,10 @@ def api_chat():
     if not prompt:
         return jsonify({'error': 'No prompt provided'}), 400
     
-    if model == 'auto' and ai_clients:
-        model = list(ai_clients.keys())[0]
+    if model == 'auto' and _MODEL_NAMES:
+        model = _MODEL_NAMES[0]
     
-    if model not in ai_clients:
+    if model not in _MODEL_SET:
         return jsonify({'error': f'Model {model} not available'}), 400
     
     try:
@@ -130,31 +268,40 @@ def api_compare():
     if not prompt or not models:
         return jsonify({'error': 'Prompt and models required'}), 400
     
-    results = []
-    for model in models:
-        if model in ai_clients:
-            try:
-                start_time = datetime.now()
-                response = get_ai_response(model, prompt, temperature)
-                end_time = datetime.now()
-                
-                results.append({
-                    'model': model,
-                    'response': response,
-                    'response_time': (end_time - start_time).total_seconds(),
-                    'timestamp': start_time.isoformat()
-                })
-            
-            except Exception as e:
-                results.append({
-                    'model': model,
-                    'error': str(e),
-                    'timestamp': datetime.now().isoformat()
-                })
+    models = [model for model in models if model in _MODEL_SET]
+    if not models:
+        return jsonify({'results': []})
+    
+    # Each call is network-bound, so run them side by side
+    with ThreadPoolExecutor(max_workers=len(models)) as executor:
+        futures = [executor.submit(_timed_call, model, prompt, temperature) for model in models]
+        results = [future.result() for future in futures]
     
     return jsonify({'results': results})
 
 
+def _timed_call(model, prompt, temperature):
+    """Get one model's response along with how long it took."""
+    timestamp = datetime.now().isoformat()
+    try:
+        start = time.perf_counter()
+        response = get_ai_response(model, prompt, temperature)
+        
+        return {
+            'model': model,
+            'response': response,
+            'response_time': time.perf_counter() - start,
+            'timestamp': timestamp
+        }
+    
+    except Exception as e:
+        return {
+            'model': model,
+            'error': str(e),
+            'timestamp': datetime.now().isoformat()
+        }
+
+
 @app.route('/api/notebooks')
 def api_notebooks():
     """Get list of available notebooks."""
@@ -166,19 +313,19 @@ def api_notebooks():
 def api_notebook_metadata(notebook_path):
     """Get notebook metadata."""
     try:
-        notebook_file = Path('notebooks') / notebook_path
-        if not notebook_file.exists():
+        notebook_file = _notebook_file(notebook_path)
+        if notebook_file is None:
             return jsonify({'error': 'Notebook not found'}), 404
         
-        with open(notebook_file, 'r', encoding='utf-8') as f:
-            nb = nbformat.read(f, as_version=4)
+        stat = notebook_file.stat()
+        nb = _read_notebook(str(notebook_file), stat.st_mtime_ns, stat.st_size)
         
         metadata = {
             'title': nb.metadata.get('title', notebook_path),
             'cells': len(nb.cells),
             'code_cells': len([cell for cell in nb.cells if cell.cell_type == 'code']),
             'markdown_cells': len([cell for cell in nb.cells if cell.cell_type == 'markdown']),
-            'last_modified': datetime.fromtimestamp(notebook_file.stat().st_mtime).isoformat()
+            'last_modified': _iso(stat.st_mtime_ns)
         }
         
         return jsonify(metadata)
@@ -200,19 +347,20 @@ def handle_run_model(data):
     model = data.get('model', 'auto')
     temperature = data.get('temperature', 0.7)
     
-    if model == 'auto' and ai_clients:
-        model = list(ai_clients.keys())[0]
+    if model == 'auto' and _MODEL_NAMES:
+        model = _MODEL_NAMES[0]
     
-    if model not in ai_clients:
+    if model not in _MODEL_SET:
         emit('model_error', {'error': f'Model {model} not available'})
         return
     
     try:
         emit('model_start', {'model': model})
-        response = get_ai_response(model, prompt, temperature)
-        emit('model_response', {
+        # Forward text as it is generated; the client assembles the full response
+        for delta in get_ai_response(model, prompt, temperature, stream=True):
+            emit('model_chunk', {'model': model, 'delta': delta})
+        emit('model_done', {
             'model': model,
-            'response': response,
             'timestamp': datetime.now().isoformat()
         })
     
@@ -220,57 +368,150 @@ def handle_run_model(data):
         emit('model_error', {'error': str(e), 'model': model})
 
 
-def get_ai_response(model: str, prompt: str, temperature: float = 0.7) -> str:
-    """Get response from AI model."""
-    if model == 'openai':
-        response = ai_clients['openai'].chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=temperature,
-            max_tokens=1000
-        )
-        return response.choices[0].message.content
+def _openai_call(prompt: str, temperature: float) -> str:
+    """Get a complete response from OpenAI."""
+    response = ai_clients['openai'].chat.completions.create(
+        model="gpt-3.5-turbo",
+        messages=[{"role": "user", "content": prompt}],
+        temperature=temperature,
+        max_tokens=1000
+    )
+    return response.choices[0].message.content
+
+
+def _anthropic_call(prompt: str, temperature: float) -> str:
+    """Get a complete response from Anthropic."""
+    response = ai_clients['anthropic'].messages.create(
+        model="claude-3-haiku-20240307",
+        max_tokens=1000,
+        temperature=temperature,
+        messages=[{"role": "user", "content": prompt}]
+    )
+    return response.content[0].text
+
+
+def _gemini_call(prompt: str, temperature: float) -> str:
+    """Get a complete response from Gemini."""
+    import google.generativeai as genai
     
-    elif model == 'anthropic':
-        response = ai_clients['anthropic'].messages.create(
-            model="claude-3-haiku-20240307",
-            max_tokens=1000,
+    response = ai_clients['gemini'].generate_content(
+        prompt,
+        generation_config=genai.types.GenerationConfig(
             temperature=temperature,
-            messages=[{"role": "user", "content": prompt}]
+            max_output_tokens=1000
         )
-        return response.content[0].text
-    
-    elif model == 'gemini':
-        response = ai_clients['gemini'].generate_content(
-            prompt,
-            generation_config=genai.types.GenerationConfig(
-                temperature=temperature,
-                max_output_tokens=1000
-            )
-        )
-        return response.text
+    )
+    return response.text
+
+
+def _openai_stream(prompt: str, temperature: float):
+    """Yield an OpenAI response piece by piece as it is generated."""
+    response = ai_clients['openai'].chat.completions.create(
+        model="gpt-3.5-turbo",
+        messages=[{"role": "user", "content": prompt}],
+        temperature=temperature,
+        max_tokens=1000,
+        stream=True
+    )
+    for chunk in response:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+def _anthropic_stream(prompt: str, temperature: float):
+    """Yield an Anthropic response piece by piece as it is generated."""
+    with ai_clients['anthropic'].messages.stream(
+        model="claude-3-haiku-20240307",
+        max_tokens=1000,
+        temperature=temperature,
+        messages=[{"role": "user", "content": prompt}]
+    ) as response:
+        yield from response.text_stream
+
+
+def _gemini_stream(prompt: str, temperature: float):
+    """Yield a Gemini response piece by piece as it is generated."""
+    import google.generativeai as genai
     
-    else:
+    response = ai_clients['gemini'].generate_content(
+        prompt,
+        generation_config=genai.types.GenerationConfig(
+            temperature=temperature,
+            max_output_tokens=1000
+        ),
+        stream=True
+    )
+    for chunk in response:
+        yield chunk.text
+
+
+# Provider name -> (prompt, temperature) handler; register new providers here
+_DISPATCH = {
+    'openai': _openai_call,
+    'anthropic': _anthropic_call,
+    'gemini': _gemini_call,
+}
+
+_STREAM_DISPATCH = {
+    'openai': _openai_stream,
+    'anthropic': _anthropic_stream,
+    'gemini': _gemini_stream,
+}
+
+
+def get_ai_response(model: str, prompt: str, temperature: float = 0.7, stream: bool = False):
+    """Get response from AI model, or an iterator of text deltas if streaming."""
+    fn = (_STREAM_DISPATCH if stream else _DISPATCH).get(model)
+    if fn is None:
         raise ValueError(f"Unknown model: {model}")
+    return fn(prompt, temperature)
+
+
+def _walk_ipynb(root):
+    """Yield a DirEntry for every notebook under root."""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith('.ipynb'):
+                    yield entry
 
 
 def get_notebook_list():
     """Get list of available notebooks."""
-    notebooks = []
-    notebooks_dir = Path('notebooks')
+    global _nb_cache, _nb_cache_key, _nb_cache_time
+    
+    notebooks_dir = str(NOTEBOOKS_ROOT)
+    try:
+        cache_key = os.stat(notebooks_dir).st_mtime_ns
+    except OSError:
+        return []
     
-    if notebooks_dir.exists():
-        for notebook_file in notebooks_dir.rglob('*.ipynb'):
-            relative_path = notebook_file.relative_to(notebooks_dir)
-            notebooks.append({
-                'path': str(relative_path),
-                'name': notebook_file.stem,
-                'category': relative_path.parent.name if relative_path.parent != Path('.') else 'root',
-                'size': notebook_file.stat().st_size,
-                'modified': datetime.fromtimestamp(notebook_file.stat().st_mtime).isoformat()
-            })
+    now = time.monotonic()
+    if (_nb_cache is not None and cache_key == _nb_cache_key
+            and now - _nb_cache_time < NOTEBOOK_LIST_TTL):
+        return list(_nb_cache)
+    
+    notebooks = []
+    for entry in _walk_ipynb(notebooks_dir):
+        relative_path = entry.path[len(notebooks_dir) + 1:]
+        parent = os.path.dirname(relative_path)
+        stat = entry.stat()
+        notebooks.append({
+            'path': relative_path,
+            'name': entry.name[:-len('.ipynb')],
+            'category': os.path.basename(parent) if parent else 'root',
+            'size': stat.st_size,
+            'modified': _iso(stat.st_mtime_ns)
+        })
     
-    return sorted(notebooks, key=lambda x: x['category'])
+    _nb_cache = sorted(notebooks, key=lambda x: x['category'])
+    _nb_cache_key = cache_key
+    _nb_cache_time = now
+    return list(_nb_cache)
 
 
 @app.route('/static/<path:filename>')
@@ -287,6 +528,6 @@ if __name__ == '__main__':
     debug = os.environ.get('DEBUG', 'False').lower() == 'true'
     
     print(f"🚀 Starting AI-Notebooks Web Interface on port {port}")
-    print(f"📊 Available AI models: {list(ai_clients.keys())}")
+    print(f"📊 Available AI models: {list(_MODEL_NAMES)}")
     
     socketio.run(app, host='0.0.0.0', port=port, debug=debug)
\ No newline at end of file